@@ -4,6 +4,11 @@ from .comparison3 import ksp_vs_iterbound_diff_k_values
 from .comparison4 import kspd_vs_kspd_minus_diff_k_values
 from .comparison5 import kspd_vs_kspd_minus_diff_t_values
 from .download_graphs import download_and_prepare_graphs
+from .benchmarks import (
+    benchmark_dijkstra, benchmark_alt, benchmark_ch, benchmark_priority_queues, benchmark_cycle_checks,
+    benchmark_similarity, benchmark_path_layout,
+    benchmark_prefix_map, benchmark_parallel_spurs,
+)
 from .draw_distribution import draw_time_distribution, draw_num_of_path_distribution
 from .draw_bar_chart import draw_bar_chart
 from .draw_line_chart import draw_line_chart
@@ -15,6 +20,15 @@ __all__ = [
     "kspd_vs_kspd_minus_diff_k_values",
     "kspd_vs_kspd_minus_diff_t_values",
     "download_and_prepare_graphs",
+    "benchmark_dijkstra",
+    "benchmark_alt",
+    "benchmark_ch",
+    "benchmark_priority_queues",
+    "benchmark_cycle_checks",
+    "benchmark_similarity",
+    "benchmark_path_layout",
+    "benchmark_prefix_map",
+    "benchmark_parallel_spurs",
     "draw_time_distribution",
     "draw_num_of_path_distribution",
     "draw_bar_chart",
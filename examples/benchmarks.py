@@ -0,0 +1,559 @@
+import heapq
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.algorithms import FindKSPD_Yen
+from src.core import (
+    BinaryHeap, CSRGraph, ContractionHierarchy, GraphIndex, GraphState, LandmarkIndex, PrefixMap, RadixHeap,
+    astar, construct_partial_spt, dijkstra,
+)
+from src.core.data_structures import Path, ResultSet
+from src.core.priority_queue import has_integer_weights
+
+WEB_GOOGLE_PATH = "/content/graph-data/web-Google.txt"
+WIKI_TALK_PATH  = "/content/graph-data/wiki-Talk.txt"
+ROAD_FLA_PATH   = "/content/graph-data/USA-road-d.FLA.gr"
+ROAD_COL_PATH   = "/content/graph-data/USA-road-d.COL.gr"
+
+ROAD_DATASETS = (("RoadCOL", ROAD_COL_PATH), ("RoadFLA", ROAD_FLA_PATH))
+ALL_DATASETS = (("web-Google", WEB_GOOGLE_PATH), ("wiki-Talk", WIKI_TALK_PATH)) + ROAD_DATASETS
+
+
+def random_node_pairs(graph, num_pairs, seed=0):
+    """Çıkış derecesi sıfır olmayan rastgele (src, dest) çiftleri."""
+    rnd = random.Random(seed)
+    n = graph.number_of_nodes()
+    pairs = []
+    while len(pairs) < num_pairs:
+        src, dest = rnd.randrange(n), rnd.randrange(n)
+        if src != dest and graph.out_degree(src) > 0:
+            pairs.append((src, dest))
+    return pairs
+
+
+def measure(func, *args, **kwargs):
+    """func'ı çalıştır; (sonuç, süre saniye, tepe bellek byte) döndür."""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def print_table(title, header, rows):
+    col_w = 16
+    line = "".join(f"{h:>{col_w}}" for h in header)
+    print("\n" + "=" * len(line))
+    print(title)
+    print("=" * len(line))
+    print(line)
+    print("-" * len(line))
+    for row in rows:
+        print("".join(f"{c:>{col_w}.4f}" if isinstance(c, float) else f"{c:>{col_w}}" for c in row))
+    print("=" * len(line) + "\n")
+
+
+def _dijkstra_path_copy(graph, src, dest):
+    """Eski graph_utils.dijkstra: her push'ta path_list + [node] kopyası."""
+    heap = [(0, src, [])]
+    visited = set()
+
+    while heap:
+        cost, node, path_list = heapq.heappop(heap)
+
+        if node in visited:
+            continue
+        visited.add(node)
+
+        if node == dest:
+            return Path.from_route(path_list + [dest], graph)
+
+        for neighbor, weight in graph.successors(node):
+            if neighbor not in visited:
+                heapq.heappush(heap, (cost + weight, neighbor, path_list + [node]))
+
+    return None
+
+
+def benchmark_dijkstra(datasets=ROAD_DATASETS, num_pairs=5):
+    """Path-list kopyalayan Dijkstra ile parent-pointer Dijkstra'nın süre ve tepe bellek karşılaştırması."""
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+        pairs = random_node_pairs(graph, num_pairs)
+
+        old_times, old_peaks, new_times, new_peaks = [], [], [], []
+        for src, dest in pairs:
+            _, elapsed, peak = measure(_dijkstra_path_copy, graph, src, dest)
+            old_times.append(elapsed)
+            old_peaks.append(peak)
+
+            _, elapsed, peak = measure(dijkstra, graph, src, dest)
+            new_times.append(elapsed)
+            new_peaks.append(peak)
+
+        rows.append((
+            name,
+            float(np.average(old_times)), float(np.average(new_times)),
+            float(np.average(old_peaks)) / 2 ** 20, float(np.average(new_peaks)) / 2 ** 20,
+        ))
+
+    print_table(
+        "Dijkstra: path-list copies vs parent pointers",
+        ("Graph", "Old Time (s)", "New Time (s)", "Old Peak (MB)", "New Peak (MB)"),
+        rows
+    )
+    return rows
+
+
+class _CountingGraph(CSRGraph):
+    """
+    successors çağrılarını sayan CSRGraph: arama başına settle edilen düğüm
+    sayısı. Dizileri graph ile paylaşır (kopya yok); gerçek bir CSRGraph
+    olduğu için GraphIndex.of ona kendi indeksini kurar.
+    """
+
+    def __init__(self, graph):
+        super().__init__(graph.offsets, graph.targets, graph.weights, graph.labels)
+        self.settled = 0
+
+    def successors(self, u):
+        self.settled += 1
+        return super().successors(u)
+
+
+def benchmark_alt(datasets=ROAD_DATASETS, num_pairs=5, num_landmarks=16):
+    """Dijkstra ile ALT A*'ın (farthest / avoid landmark seçimi) settle ettiği düğüm sayısı ve süresi."""
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+        pairs = random_node_pairs(graph, num_pairs)
+        counting = _CountingGraph(graph)
+
+        row = [name]
+        for strategy in (None, "farthest", "avoid"):
+            landmarks = None
+            if strategy is not None:
+                landmarks = LandmarkIndex.build(graph, count=num_landmarks, strategy=strategy)
+
+            settled, times = [], []
+            for src, dest in pairs:
+                counting.settled = 0
+                start_time = time.perf_counter()
+                if landmarks is None:
+                    dijkstra(counting, src, dest)
+                else:
+                    astar(counting, src, dest, landmarks.heuristic_to(dest))
+                times.append(time.perf_counter() - start_time)
+                settled.append(counting.settled)
+
+            row += [int(np.average(settled)), float(np.average(times))]
+        rows.append(tuple(row))
+
+    print_table(
+        f"Settled nodes: Dijkstra vs ALT ({num_landmarks} landmarks)",
+        ("Graph", "Dijkstra", "Time (s)", "ALT farthest", "Time (s)", "ALT avoid", "Time (s)"),
+        rows
+    )
+    return rows
+
+
+def benchmark_ch(datasets=ROAD_DATASETS, num_pairs=5):
+    """d(src, dest) için dest'ten büyüyen kısmi ters SPT ile Contraction Hierarchies sorgusunun karşılaştırması."""
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+        pairs = random_node_pairs(graph, num_pairs)
+
+        start_time = time.perf_counter()
+        hierarchy = ContractionHierarchy.build(graph)
+        build_time = time.perf_counter() - start_time
+
+        spt_times, spt_settled, ch_times = [], [], []
+        for src, dest in pairs:
+            start_time = time.perf_counter()
+            graph_state = GraphState(graph.reverse(), dest)
+            construct_partial_spt(graph_state=graph_state, v=src)
+            spt_times.append(time.perf_counter() - start_time)
+            spt_settled.append(len(graph_state.touched))
+            graph_state.release()
+
+            start_time = time.perf_counter()
+            hierarchy.distance(src, dest)
+            ch_times.append(time.perf_counter() - start_time)
+
+        rows.append((
+            name, build_time,
+            int(np.average(spt_settled)), float(np.average(spt_times)), float(np.average(ch_times)),
+        ))
+
+    print_table(
+        "d(src, dest): partial reverse SPT vs Contraction Hierarchies",
+        ("Graph", "CH Build (s)", "SPT Touched", "SPT Time (s)", "CH Time (s)"),
+        rows
+    )
+    return rows
+
+
+def benchmark_priority_queues(datasets=ALL_DATASETS, num_pairs=5):
+    """Dijkstra ve kısmi ters SPT: heapq, ağırlıklara göre seçilen kuyruk ve radix heap."""
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+        pairs = random_node_pairs(graph, num_pairs)
+        indexes = (GraphIndex.of(graph), GraphIndex.of(graph.reverse()))
+        selected = indexes[0].queue_factory
+
+        queues = [BinaryHeap, selected]
+        if has_integer_weights(graph):
+            queues.append(RadixHeap)
+
+        row = [name, getattr(selected, "func", selected).__name__]
+        for factory in queues:
+            for index in indexes:
+                index.queue_factory = factory
+
+            dijkstra_times, spt_times = [], []
+            for src, dest in pairs:
+                start_time = time.perf_counter()
+                dijkstra(graph, src, dest)
+                dijkstra_times.append(time.perf_counter() - start_time)
+
+                start_time = time.perf_counter()
+                graph_state = GraphState(graph.reverse(), dest)
+                construct_partial_spt(graph_state=graph_state, v=src)
+                spt_times.append(time.perf_counter() - start_time)
+                graph_state.release()
+
+            row += [float(np.average(dijkstra_times)), float(np.average(spt_times))]
+
+        for index in indexes:
+            index.queue_factory = selected
+        rows.append(tuple(row + ["-", "-"] * (3 - len(queues))))
+
+    print_table(
+        "Priority queues: heapq vs weight-selected queue vs radix heap",
+        ("Graph", "Queue", "heapq Dijk (s)", "heapq SPT (s)", "Queue Dijk (s)", "Queue SPT (s)",
+         "Radix Dijk (s)", "Radix SPT (s)"),
+        rows
+    )
+    return rows
+
+
+def benchmark_cycle_checks(datasets=ROAD_DATASETS, num_pairs=5):
+    """
+    _extend_path'in döngü kontrolü: uzun yol boyunca her düğümün komşuları
+    için route listesi taraması ile Path'in artımlı düğüm kümesi.
+    """
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+        pairs = random_node_pairs(graph, num_pairs)
+
+        hops, list_times, set_times = [], [], []
+        for src, dest in pairs:
+            shortest_path = dijkstra(graph, src, dest)
+            if shortest_path is None:
+                continue
+            route = shortest_path.route
+            hops.append(len(route))
+
+            start_time = time.perf_counter()
+            prefix = []
+            for vertex in route:
+                prefix.append(vertex)
+                for neighbor, _ in graph.successors(vertex):
+                    neighbor in prefix
+            list_times.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            nodes = shortest_path.nodes()
+            path = Path()
+            path.append(route[0])
+            for node in nodes[1:]:
+                path.append(node.vertex, node.weight, node.edge)
+                for neighbor, _ in graph.successors(node.vertex):
+                    neighbor in path
+            set_times.append(time.perf_counter() - start_time)
+
+        rows.append((
+            name, int(np.average(hops)), float(np.average(list_times)), float(np.average(set_times)),
+        ))
+
+    print_table(
+        "Cycle checks along shortest paths: route list scan vs vertex set",
+        ("Graph", "Avg Hops", "List (s)", "Set (s)"),
+        rows
+    )
+    return rows
+
+
+def _similarity_edge_sets(path, threshold, result_set):
+    """Eski Path.similarity: her sonuç için (u, v) tuple kümeleri kurar."""
+    for old_path in result_set:
+        common_edges = set(old_path.edges.keys()).intersection(set(path.edges.keys()))
+        intersection_length = sum(old_path.edges[e] for e in common_edges)
+        union_length = path.length + old_path.length - intersection_length
+
+        if union_length > 0 and intersection_length / union_length > threshold:
+            return False
+    return True
+
+
+def benchmark_similarity(datasets=ROAD_DATASETS, ks=(10, 100), num_candidates=20):
+    """
+    Bir adayın k sonuç yoluna benzerliği: (u, v) kümeleri ile kenar id
+    matrisi üzerinde vektörel kesişim. threshold = 1 ile erken çıkış olmaz,
+    her iki yöntem de tüm sonuçları gezer.
+    """
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+        paths = []
+        for src, dest in random_node_pairs(graph, max(ks) + num_candidates):
+            path = dijkstra(graph, src, dest)
+            if path is not None:
+                paths.append(path)
+        candidates = paths[:num_candidates]
+
+        for k in ks:
+            results = paths[num_candidates:num_candidates + k]
+            result_set = ResultSet(results)
+
+            start_time = time.perf_counter()
+            for candidate in candidates:
+                _similarity_edge_sets(candidate, 1.0, results)
+            set_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            for candidate in candidates:
+                Path(node=candidate.node).similarity(1.0, result_set)
+            vector_time = time.perf_counter() - start_time
+
+            dict_bytes = np.average([sys.getsizeof(path.edges) for path in results])
+            array_bytes = np.average([path.edge_ids().nbytes for path in results])
+            rows.append((
+                name, len(results), set_time / len(candidates), vector_time / len(candidates),
+                int(dict_bytes), int(array_bytes),
+            ))
+
+    print_table(
+        "Similarity against k results: (u, v) sets vs edge-id matrix",
+        ("Graph", "k", "Sets (s)", "Vectorised (s)", "Dict (B/path)", "Array (B/path)"),
+        rows
+    )
+    return rows
+
+
+@dataclass
+class _CopiedPath:
+    """Eski Path düzeni: dataclass; route ve edges her uzatmada kopyalanır."""
+    route: list = field(default_factory=list)
+    edges: dict = field(default_factory=dict)
+    length: float = 0.0
+    lb: float = 0.0
+    cls: tuple = None
+    is_active: bool = True
+    cached_intersections: dict = field(default_factory=dict)
+
+    def __lt__(self, other):
+        return (not self.is_active, self.lb) < (not other.is_active, other.lb)
+
+    def extended(self, vertex, weight):
+        edges = self.edges.copy()
+        edges[(self.route[-1], vertex)] = weight
+        return _CopiedPath(
+            self.route + [vertex], edges, self.length + weight, self.lb, self.cls, self.is_active,
+            self.cached_intersections.copy()
+        )
+
+
+def _spawn_candidates(graph, route, root, extend):
+    """_extend_path gibi: route'un her önekinden her komşuya bir aday yol."""
+    candidates = []
+    prefix = root
+    for vertex, next_vertex in zip(route, route[1:]):
+        for edge, (neighbor, weight) in enumerate(graph.successors(vertex), graph.offsets[vertex]):
+            candidates.append(extend(prefix, neighbor, weight, edge))
+        edge = graph.edge_index(vertex, next_vertex)
+        prefix = extend(prefix, next_vertex, graph.weights[edge], edge)
+    return candidates
+
+
+def benchmark_path_layout(datasets=ROAD_DATASETS, num_pairs=3):
+    """
+    Aday yol başına bellek ve LQ heap'ine push / pop süresi: kopyalanan
+    dataclass yolları (Path.__lt__ ile) ile paylaşımlı önekli __slots__
+    Path'ler (heap_entry tuple'ları ile).
+    """
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+
+        for src, dest in random_node_pairs(graph, num_pairs):
+            shortest_path = dijkstra(graph, src, dest)
+            if shortest_path is None:
+                continue
+            route = shortest_path.route
+            row = [name, len(route)]
+
+            old_root = _CopiedPath(route=[src])
+            new_root = Path()
+            new_root.append(src)
+            layouts = (
+                (old_root, lambda p, v, w, e: p.extended(v, w), lambda p: p),
+                (new_root, lambda p, v, w, e: p.extended(v, w, e), Path.heap_entry),
+            )
+
+            for root, extend, entry in layouts:
+                tracemalloc.start()
+                candidates = _spawn_candidates(graph, route, root, extend)
+                used, _ = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                rnd = random.Random(0)
+                for candidate in candidates:
+                    candidate.lb = rnd.random()
+
+                heap = []
+                start_time = time.perf_counter()
+                for candidate in candidates:
+                    heapq.heappush(heap, entry(candidate))
+                push_time = time.perf_counter() - start_time
+
+                start_time = time.perf_counter()
+                while heap:
+                    heapq.heappop(heap)
+                pop_time = time.perf_counter() - start_time
+
+                row += [
+                    int(used / len(candidates)),
+                    push_time / len(candidates) * 1e6,
+                    pop_time / len(candidates) * 1e6,
+                ]
+            rows.append(tuple(row))
+
+    print_table(
+        "Candidate paths: copied dataclass vs shared-prefix __slots__ Path",
+        ("Graph", "Hops", "Old B/path", "Old push (us)", "Old pop (us)",
+         "New B/path", "New push (us)", "New pop (us)"),
+        rows
+    )
+    return rows
+
+
+class _TuplePrefixMap:
+    """Eski PrefixMap: her önek için tuple(route[:i+1]) anahtarı ve liste."""
+
+    def __init__(self):
+        self.map = {}
+
+    def insert(self, path):
+        for i in range(len(path.route)):
+            self.map.setdefault(tuple(path.route[:i + 1]), []).append(path)
+
+    def remove(self, path):
+        for i in range(len(path.route)):
+            paths = self.map.get(tuple(path.route[:i + 1]))
+            if paths is not None and path in paths:
+                paths.remove(path)
+
+
+def benchmark_prefix_map(datasets=ROAD_DATASETS, num_pairs=3):
+    """Aday yolları önek eşlemine ekleme / çıkarma: tuple anahtarlı dict ile trie (bellek ve süre)."""
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+
+        for src, dest in random_node_pairs(graph, num_pairs):
+            shortest_path = dijkstra(graph, src, dest)
+            if shortest_path is None:
+                continue
+            root = Path()
+            root.append(src)
+            candidates = _spawn_candidates(graph, shortest_path.route, root, lambda p, v, w, e: p.extended(v, w, e))
+            for candidate in candidates:
+                candidate.route  # route'lar iki ölçümün de dışında kalsın
+
+            row = [name, len(shortest_path.route), len(candidates)]
+            for prefix_map in (_TuplePrefixMap(), PrefixMap()):
+                tracemalloc.start()
+                start_time = time.perf_counter()
+                for candidate in candidates:
+                    prefix_map.insert(candidate)
+                insert_time = time.perf_counter() - start_time
+                used, _ = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                start_time = time.perf_counter()
+                for candidate in candidates:
+                    prefix_map.remove(candidate)
+                remove_time = time.perf_counter() - start_time
+
+                row += [used / 2 ** 20, insert_time, remove_time]
+            rows.append(tuple(row))
+
+    print_table(
+        "Prefix map: tuple-keyed dict vs trie",
+        ("Graph", "Hops", "Paths", "Dict (MB)", "Dict Ins (s)", "Dict Rem (s)",
+         "Trie (MB)", "Trie Ins (s)", "Trie Rem (s)"),
+        rows
+    )
+    return rows
+
+
+def benchmark_parallel_spurs(datasets=ALL_DATASETS, num_pairs=2, k=5, worker_counts=(1, 2, 4, 8)):
+    """
+    FindKSPD_Yen: tek süreçli spur aramaları ile spur_workers süreçli havuz
+    (süre ve hızlanma). Çekirdek sayısını aşan worker sayıları da ölçülür,
+    ama tabloda * ile işaretlenir: o sütunlar hızlanmayı değil aşırı
+    abonelik maliyetini gösterir.
+    """
+    cores = os.cpu_count() or 1
+    oversubscribed = [w for w in worker_counts if w > cores]
+    if oversubscribed:
+        print(f"note: {cores} CPU core(s); worker counts {oversubscribed} exceed it and are marked with *")
+    rows = []
+    for name, filename in datasets:
+        print(f"working on {name}")
+        graph = CSRGraph.from_file(filename)
+        pairs = random_node_pairs(graph, num_pairs)
+
+        def run(algorithm):
+            start_time = time.perf_counter()
+            for src, dest in pairs:
+                algorithm.find_paths(src, dest, k)
+            return (time.perf_counter() - start_time) / len(pairs)
+
+        serial_time = run(FindKSPD_Yen(graph, threshold=0.5))
+        row = [name, serial_time]
+        for workers in worker_counts:
+            algorithm = FindKSPD_Yen(graph, threshold=0.5, spur_workers=workers)
+            algorithm.find_paths(*pairs[0], 1)  # havuz ve paylaşılan graf ölçüm dışında kurulsun
+            elapsed = run(algorithm)
+            algorithm.close()
+            row += [elapsed, serial_time / elapsed]
+        rows.append(tuple(row))
+
+    header = ["Graph", "Serial (s)"]
+    for workers in worker_counts:
+        mark = "*" if workers > cores else ""
+        header += [f"{workers}{mark} proc (s)", f"{workers}{mark} speedup"]
+    print_table(f"Yen spur searches: serial vs process pool (k = {k})", header, rows)
+    return rows
@@ -1,14 +1,53 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Hashable, List, Optional, Union
 import networkx as nx
+from ..core.contraction_hierarchy import ContractionHierarchy
+from ..core.csr_graph import CSRGraph
 from ..core.data_structures import Path
+from ..core.graph_index import GraphIndex
+from ..core.graph_utils import astar, bidirectional_dijkstra, dijkstra, shortest_path_from_spt
+from ..core.landmarks import LandmarkIndex
 
 
 class BasePathFindingAlgorithm(ABC):
-    def __init__(self, graph: nx.DiGraph, threshold: float = 0.5):
-        self.graph = graph
+    # İlk (en kısa) yolun nasıl bulunacağı:
+    #   "dijkstra": src'den ileri Dijkstra
+    #   "spt":      dest köklü ters SPT'yi src'ye kadar büyütüp parent
+    #               zincirini oku (LB1 için zaten kurulan ağaç kullanılır)
+    #   "bidirectional": src ve dest'ten eş zamanlı Dijkstra (ters CSR ile)
+    #   "alt":      landmark alt sınırlarıyla A* (landmarks gerekir)
+    FIRST_PATH_METHODS = ("dijkstra", "spt", "bidirectional", "alt")
+
+    def __init__(
+            self,
+            graph: Union[nx.DiGraph, CSRGraph, GraphIndex],
+            threshold: float = 0.5,
+            first_path: str = "dijkstra",
+            landmarks: Optional[LandmarkIndex] = None,
+            hierarchy: Optional[ContractionHierarchy] = None
+    ):
+        # Graf başına bir kez kurulan ve tüm algoritma nesneleri/sorgular
+        # arasında paylaşılan indeks. Algoritmalar doğrudan CSR dizileri
+        # üzerinde çalışır.
+        self.index = GraphIndex.of(graph)
+        self.graph = self.index.graph
         self.threshold = threshold
 
+        if first_path not in self.FIRST_PATH_METHODS:
+            raise ValueError(f"first_path {self.FIRST_PATH_METHODS} değerlerinden biri olmalı")
+        self.first_path = first_path
+
+        # Verilmezse graf indeksine atanmış landmark'lar kullanılır
+        self.landmarks = landmarks if landmarks is not None else self.index.landmarks
+        if self.landmarks is not None and self.landmarks.number_of_nodes() != self.graph.number_of_nodes():
+            raise ValueError("landmarks bu grafın düğüm sayısıyla uyuşmuyor")
+        self.hierarchy = hierarchy if hierarchy is not None else self.index.hierarchy
+        if self.hierarchy is not None and self.hierarchy.number_of_nodes() != self.graph.number_of_nodes():
+            raise ValueError("hierarchy bu grafın düğüm sayısıyla uyuşmuyor")
+
+        if first_path == "alt" and self.landmarks is None:
+            raise ValueError("first_path='alt' için landmarks gerekli")
+
     @abstractmethod
     def find_paths(
             self,
@@ -38,4 +77,42 @@ class BasePathFindingAlgorithm(ABC):
         if k < 1:
             raise ValueError("k en az 1 olmalı")
         if not (0 < self.threshold < 1):
-            raise ValueError("Threshold 0 ile 1 arasında olmalı")
\ No newline at end of file
+            raise ValueError("Threshold 0 ile 1 arasında olmalı")
+
+    def to_internal(self, src: Hashable, dest: Hashable):
+        """Düğüm etiketlerini CSR id'lerine çevir."""
+        return self.graph.node_id(src), self.graph.node_id(dest)
+
+    def to_labels(self, paths: List[Path]) -> List[Path]:
+        """Sonuç yollarındaki CSR id'lerini orijinal düğüm etiketlerine çevir."""
+        if self.graph.labels is None:
+            return paths
+
+        label = self.graph.node_label
+        return [path.relabel(label) for path in paths]
+
+    def find_first_path(self, src: int, dest: int, graph_state=None) -> Optional[Path]:
+        """İlk en kısa yolu first_path ayarına göre bul."""
+        if self.first_path == "spt":
+            if graph_state is None:
+                graph_state = self.index.spt_cache.get(dest)
+            return shortest_path_from_spt(self.graph, graph_state, src)
+
+        if self.first_path == "bidirectional":
+            return bidirectional_dijkstra(self.graph, self.index.reverse, src, dest)
+
+        if self.first_path == "alt":
+            return astar(self.graph, src, dest, self.landmarks.heuristic_to(dest))
+
+        return dijkstra(self.graph, src, dest)
+
+    def heuristic_to(self, dest: int):
+        """
+        dest'e mesafe için en iyi alt sınır: hierarchy varsa kesin CH
+        oracle'ı, landmark varsa ALT dizisi, hiçbiri yoksa None.
+        """
+        if self.hierarchy is not None:
+            return self.hierarchy.distances_to(dest)
+        if self.landmarks is None:
+            return None
+        return self.landmarks.heuristic_to(dest)
@@ -1,10 +1,16 @@
 import heapq
+from itertools import count
 import networkx as nx
-from typing import List, Optional, Tuple, Set
+from typing import List, Optional, Tuple, Set, Union
 
 from .base import BasePathFindingAlgorithm
-from ..core.data_structures import Path, GraphState
-from ..core.graph_utils import dijkstra, reverse, construct_partial_spt
+from ..core.csr_graph import CSRGraph
+from ..core.data_structures import Path, GraphState, ResultSet
+from ..core.graph_utils import construct_partial_spt
+
+# Subspace.order: Q'daki eşit anahtarlar için kararlı sıra
+_subspace_order = count()
+
 
 class Subspace:
     """
@@ -12,11 +18,18 @@ class Subspace:
     S = <P_{s,u}, X_u>
     - P_{s,u}: s'den u'ya giden yol (prefix)
     - X_u: u düğümünden çıkan yasaklı kenarlar
+
+    Q'ya (anahtar, order, subspace) olarak girer; order tek olduğundan
+    heapq karşılaştırması __lt__'e hiç inmez.
     """
+
+    __slots__ = ("path_prefix", "excluded_edges", "computed_path", "order")
+
     def __init__(self, path_prefix: Optional[Path] = None, excluded_edges: Optional[Set[Tuple[int, int]]] = None):
         self.path_prefix = path_prefix if path_prefix else Path()
         self.excluded_edges = excluded_edges if excluded_edges else set()
         self.computed_path: Optional[Path] = None  # En kısa yol hesaplanmışsa
+        self.order = next(_subspace_order)
 
     def __lt__(self, other: "Subspace") -> bool:
         """Priority queue için karşılaştırma"""
@@ -34,10 +47,22 @@ class Subspace:
         return my_key < other_key
 
 class FindIterBound(BasePathFindingAlgorithm):
-    def __init__(self, graph: nx.DiGraph, threshold: float = 0.5):
-        super().__init__(graph, threshold)
+    def __init__(self, graph: Union[nx.DiGraph, CSRGraph], threshold: float = 0.5, **kwargs):
+        super().__init__(graph, threshold, **kwargs)
         self.number_of_paths_explored = 0 # Instance variable for count
 
+    def _distance_to_dest(self, graph_state: GraphState, v: int) -> float:
+        """
+        v'den hedefe mesafe için alt sınır: v settle edilmişse SPT'deki kesin
+        değer, değilse graph_state.heuristic (landmark alt sınırı ya da CH
+        mesafesi); ikisi de yoksa SPT v'ye kadar büyütülür.
+        """
+        if graph_state.isSettled[v]:
+            return graph_state.distances[v]
+        if graph_state.heuristic is not None:
+            return graph_state.heuristic[v]
+        return construct_partial_spt(graph_state=graph_state, v=v)
+
     def _compute_lower_bound(self, subspace: Subspace, graph_state: GraphState) -> float:
         """
         CompLB: Alt-uzay için alt sınır hesapla
@@ -52,26 +77,24 @@ class FindIterBound(BasePathFindingAlgorithm):
         has_valid_neighbor = False
 
         # u'nun her geçerli komşusu için
-        for neighbor in self.graph[u]:
+        for neighbor, edge_weight in self.graph.successors(u):
             # Geçerli kenar mı kontrol et
-            if neighbor in subspace.path_prefix.route:  # Döngü oluşturur
+            if neighbor in subspace.path_prefix:  # Döngü oluşturur
                 continue
             if (u, neighbor) in subspace.excluded_edges:  # Yasaklı
                 continue
 
             has_valid_neighbor = True
 
-            # neighbor'dan hedefe olan mesafeyi SPT'den al
-            if not graph_state.isSettled[neighbor]:
-                construct_partial_spt(graph_state=graph_state, v=neighbor) # Use imported function
+            # neighbor'dan hedefe olan mesafe (SPT ya da landmark alt sınırı)
+            distance = self._distance_to_dest(graph_state, neighbor)
 
             # Eğer neighbor'dan hedefe yol yoksa, skip
-            if graph_state.distances[neighbor] == float('inf'):
+            if distance == float('inf'):
                 continue
 
             # Tahmin: prefix uzunluğu + edge weight + SPT distance
-            edge_weight = self.graph[u][neighbor]['weight']
-            estimate = subspace.path_prefix.length + edge_weight + graph_state.distances[neighbor]
+            estimate = subspace.path_prefix.length + edge_weight + distance
             lb = min(lb, estimate)
 
         # Eğer hiç geçerli komşu yoksa veya hepsi infinity ise
@@ -88,24 +111,18 @@ class FindIterBound(BasePathFindingAlgorithm):
         Eğer shortest path <= tau ise yolu döndür, değilse None
         """
         u = subspace.path_prefix.tail()
-        prefix_route = subspace.path_prefix.route
         prefix_length = subspace.path_prefix.length
 
         # A* benzeri arama - sadece estimated distance <= tau olanları genişlet
         distances = {u: prefix_length}
+        # Yalnızca u'dan sonraki parent'lar; prefix, yol kurulurken paylaşılır
         parent = {}
 
-        # Prefix'teki parent ilişkilerini kopyala
-        for i in range(len(prefix_route) - 1):
-            parent[prefix_route[i+1]] = prefix_route[i]
-
         # Priority queue: (estimated_distance, actual_distance, node)
         pq: List[Tuple[float, float, int]] = []
 
         # u'dan hedefe tahmini mesafe
-        if not graph_state.isSettled[u]:
-            construct_partial_spt(graph_state=graph_state, v=u) # Use imported function
-        estimated = prefix_length + graph_state.distances[u]
+        estimated = prefix_length + self._distance_to_dest(graph_state, u)
 
         heapq.heappush(pq, (estimated, prefix_length, u))
         visited = set()
@@ -113,49 +130,50 @@ class FindIterBound(BasePathFindingAlgorithm):
         while pq:
             est_dist, actual_dist, node = heapq.heappop(pq)
 
-            if node in visited:
+            if graph_state.heuristic is None:
+                if node in visited:
+                    continue
+                visited.add(node)
+            elif actual_dist > distances[node]:
+                # SPT mesafeleriyle landmark sınırları karışınca tahmin
+                # tutarlı olmayabilir: daha kısa mesafe bulunan düğüm yeniden
+                # açılır, hedef yine ilk çıkışında en kısadır
                 continue
-            visited.add(node)
             self.number_of_paths_explored += 1 # Use instance variable
 
             # Hedefe ulaştık mı?
             if node == dest:
-                # Yolu yeniden oluştur
-                path = Path()
+                # Yolu yeniden oluştur: prefix düğümleri paylaşılır,
+                # yalnızca u'dan sonraki kısım eklenir
                 current = dest
                 route_reversed = []
 
-                while current is not None:
+                while current != u:
                     route_reversed.append(current)
-                    current = parent.get(current)
+                    current = parent[current]
 
-                path.route = list(reversed(route_reversed))
-
-                # Kenarları ve uzunluğu hesapla
-                for i in range(len(path.route) - 1):
-                    u_edge, v_edge = path.route[i], path.route[i+1]
-                    weight = self.graph[u_edge][v_edge]['weight']
-                    path.edges[(u_edge, v_edge)] = weight
-                    path.length += weight
+                path = Path(node=subspace.path_prefix.node)
+                previous = u
+                for v_edge in reversed(route_reversed):
+                    edge = self.graph.edge_index(previous, v_edge)
+                    path.append(v_edge, self.graph.weights[edge], edge)
+                    previous = v_edge
 
                 path.lb = path.length
                 return path
 
             # Komşuları genişlet
-            for neighbor in self.graph[node]:
+            for neighbor, weight in self.graph.successors(node):
                 # Geçerli kenar mı?
-                if neighbor in prefix_route:  # Döngü
+                if neighbor in subspace.path_prefix:  # Döngü
                     continue
                 if (node, neighbor) in subspace.excluded_edges:  # Yasaklı
                     continue
 
-                new_dist = actual_dist + self.graph[node][neighbor]['weight']
-
-                # neighbor'dan hedefe tahmini mesafe (SPT kullanarak)
-                if not graph_state.isSettled[neighbor]:
-                    construct_partial_spt(graph_state=graph_state, v=neighbor) # Use imported function
+                new_dist = actual_dist + weight
 
-                estimated_to_dest = new_dist + graph_state.distances[neighbor]
+                # neighbor'dan hedefe tahmini mesafe (SPT ya da landmark)
+                estimated_to_dest = new_dist + self._distance_to_dest(graph_state, neighbor)
 
                 # BUDAMA: Sadece tau'dan küçük tahminli düğümleri ekle
                 if estimated_to_dest <= tau:
@@ -179,35 +197,26 @@ class FindIterBound(BasePathFindingAlgorithm):
         new_subspaces: List[Subspace] = []
 
         # computed_path'teki her düğümde deviation yap
+        computed_nodes = computed_path.nodes()
+        # computed_path.route[:i+1]'deki düğümler, artımlı: döngü kontrolü O(1)
+        prefix_vertices = set()
         for i in range(len(computed_path.route) - 1):  # Son düğüm hariç (hedef)
             vertex = computed_path.route[i]
             next_in_path = computed_path.route[i + 1]
+            prefix_vertices.add(vertex)
 
-            # Bu düğüme kadar olan prefix'i oluştur
-            new_prefix = Path()
-            new_prefix.route = computed_path.route[:i+1]
-
-            # Prefix'in kenarlarını ve uzunluğunu hesapla
-            for j in range(len(new_prefix.route) - 1):
-                u, v = new_prefix.route[j], new_prefix.route[j+1]
-                if (u, v) in computed_path.edges:
-                    new_prefix.edges[(u, v)] = computed_path.edges[(u, v)]
-                    new_prefix.length += computed_path.edges[(u, v)]
+            # Bu düğüme kadar olan prefix, computed_path'in düğümlerini paylaşır
+            new_prefix = Path(node=computed_nodes[i])
 
             # Bu düğümün TÜM alternatif kenarları için alt-uzay oluştur
-            for neighbor in self.graph[vertex]:
+            for edge, (neighbor, edge_weight) in enumerate(self.graph.successors(vertex), self.graph.offsets[vertex]):
                 # Sadece path'te kullanılmayan kenarlara bak
-                if neighbor != next_in_path and neighbor not in computed_path.route[:i+1]:
+                if neighbor != next_in_path and neighbor not in prefix_vertices:
                     # Yeni alt-uzay: vertex'ten sonra next_in_path kenarını yasakla
                     # ve neighbor'a git
                     new_subspace = Subspace()
-                    new_subspace.path_prefix = new_prefix.copy()
-
                     # neighbor'ı prefix'e ekle
-                    new_subspace.path_prefix.route.append(neighbor)
-                    edge_weight = self.graph[vertex][neighbor]['weight']
-                    new_subspace.path_prefix.edges[(vertex, neighbor)] = edge_weight
-                    new_subspace.path_prefix.length += edge_weight
+                    new_subspace.path_prefix = new_prefix.extended(neighbor, edge_weight, edge)
 
                     # Path'teki kenarı yasakla
                     new_subspace.excluded_edges = set()
@@ -239,19 +248,20 @@ class FindIterBound(BasePathFindingAlgorithm):
             result_set: k en kısa yol listesi
         """
         self.validate_parameters(src, dest, k) # Use validation from base class
+        src, dest = self.to_internal(src, dest)
 
         self.number_of_paths_explored = 0
 
-        graph_reverse = reverse(self.graph) # Use imported function
-
-        # GraphState: SPT yapısı
-        graph_state = GraphState(graph_reverse=graph_reverse, destination=dest)
+        # GraphState: SPT yapısı. Aynı hedefe gelen önceki sorguların
+        # ağacı önbellekten alınır ve settle edilmiş sınırdan devam edilir.
+        graph_state = self.index.spt_cache.get(dest)
+        graph_state.heuristic = self.heuristic_to(dest)
 
         # 1. İlk en kısa yolu hesapla (P0)
-        P0 = dijkstra(graph=self.graph, src=src, dest=dest) # Use imported function
+        P0 = self.find_first_path(src, dest, graph_state)
 
         if P0 is None:
-            print(f"No path exists between {src} and {dest}")
+            print(f"No path exists between {self.graph.node_label(src)} and {self.graph.node_label(dest)}")
             return []
 
 
@@ -261,14 +271,13 @@ class FindIterBound(BasePathFindingAlgorithm):
 
         initial_subspace = Subspace()
         initial_subspace.path_prefix = Path()
-        initial_subspace.path_prefix.route = [src]
-        initial_subspace.path_prefix.length = 0
+        initial_subspace.path_prefix.append(src)
         initial_subspace.computed_path = P0
 
-        heapq.heappush(Q, (P0.length, id(initial_subspace), initial_subspace))
+        heapq.heappush(Q, (P0.length, initial_subspace.order, initial_subspace))
 
         # 3. Sonuç listesi ve tau başlat
-        result_set: List[Path] = []
+        result_set: ResultSet = ResultSet()
         tau = P0.length # Use P0.length as initial tau
         i = 1  # Path counter
         max_iterations = 10000 # Hardcode max_iterations or pass as param to constructor
@@ -309,7 +318,7 @@ class FindIterBound(BasePathFindingAlgorithm):
                         new_lb = max(new_lb, path.length)
 
                         new_sub.path_prefix.lb = new_lb
-                        heapq.heappush(Q, (new_lb, id(new_sub), new_sub))
+                        heapq.heappush(Q, (new_lb, new_sub.order, new_sub))
             else:
                 # Alt-uzayın en kısa yolu henüz hesaplanmamış
 
@@ -337,12 +346,12 @@ class FindIterBound(BasePathFindingAlgorithm):
                     # En kısa yol bulundu ve tau'dan küçük
                     subspace.computed_path = computed_path
                     # Re-add to Q with its actual length for proper priority
-                    heapq.heappush(Q, (computed_path.length, id(subspace), subspace))
+                    heapq.heappush(Q, (computed_path.length, subspace.order, subspace))
                 else:
                     # tau'dan küçük yol yok, alt sınırı tau olarak güncelle
                     subspace.path_prefix.lb = tau
                     # Re-add to Q with updated LB
-                    heapq.heappush(Q, (tau, id(subspace), subspace))
+                    heapq.heappush(Q, (tau, subspace.order, subspace))
 
         # Infinite loop check
         if iteration_count >= max_iterations:
@@ -351,6 +360,6 @@ class FindIterBound(BasePathFindingAlgorithm):
 
         # Queue boşsa ama k'ya ulaşmadıysak
         if len(result_set) < k and not Q:
-            print(f"Only {len(result_set)} paths exist between {src} and {dest}")
+            print(f"Only {len(result_set)} paths exist between {self.graph.node_label(src)} and {self.graph.node_label(dest)}")
 
-        return result_set
\ No newline at end of file
+        return self.to_labels(result_set)
\ No newline at end of file
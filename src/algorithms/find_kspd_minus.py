@@ -1,21 +1,17 @@
-from typing import Dict, List, Optional
-import heapq
+from typing import List, Optional, Union
 import networkx as nx
 
 from .base import BasePathFindingAlgorithm
-from ..core.data_structures import Path, GraphState
-from ..core.graph_utils import (
-    reverse, 
-    dijkstra
-)
-from ..core.prefix_map import PrefixMap
-
+from ..core.csr_graph import CSRGraph
+from ..core.data_structures import Path, GraphState, ResultSet
+from ..core.graph_utils import construct_partial_spt
+from ..core.search_arena import SearchArena, SearchArenaPool
 
 class FindKSPD_Minus(BasePathFindingAlgorithm):
-    def __init__(self, graph: nx.DiGraph, threshold: float = 0.5):
-        super().__init__(graph, threshold)
-        self.prefix_map = PrefixMap()
-        self.global_LQ_ids = set()
+    def __init__(self, graph: Union[nx.DiGraph, CSRGraph], threshold: float = 0.5, **kwargs):
+        super().__init__(graph, threshold, **kwargs)
+        # Sorgu başına arama durumu (önek trie'si, kuyruklar) havuzdan alınır
+        self.arenas = SearchArenaPool()
         self.number_of_paths_explored = 0
 
     def find_paths(
@@ -26,35 +22,35 @@ class FindKSPD_Minus(BasePathFindingAlgorithm):
     ) -> List[Path]:
 
         self.validate_parameters(src, dest, k)
+        src, dest = self.to_internal(src, dest)
+        self.number_of_paths_explored = 0
 
-        graph_reverse = reverse(self.graph)
-
-        graph_state = GraphState(graph_reverse, dest)
+        # Aynı hedefe gelen önceki sorguların ters SPT'sinden devam et
+        graph_state = self.index.spt_cache.get(dest)
+        graph_state.heuristic = self.heuristic_to(dest)
 
-        result_set: List[Path] = []
+        result_set: ResultSet = ResultSet()
 
-        shortest_path = dijkstra(self.graph, src, dest)
+        shortest_path = self.find_first_path(src, dest, graph_state)
         if shortest_path is None:
-            print(f"No path exists between {src} and {dest}")
+            print(f"No path exists between {self.graph.node_label(src)} and {self.graph.node_label(dest)}")
             return result_set
 
         result_set.append(shortest_path)
 
-        global_pq: List = [] # Global Priority Queue
-        lq: Dict[int, List[Path]] = {} # Local Priority Queues per node
-        covered_vertices: Dict = {} # Covered vertices for class-based paths
-
-        self._generate_initial_paths(
-            shortest_path, src, dest, global_pq, lq, covered_vertices, graph_state
-        )
+        arena = self.arenas.acquire()
+        try:
+            self._generate_initial_paths(shortest_path, src, dest, arena, graph_state)
 
-        while len(result_set) < k and global_pq:
-            new_path = self._find_next_path(graph_state, global_pq, lq, result_set, dest, covered_vertices)
+            while len(result_set) < k and arena.global_pq:
+                new_path = self._find_next_path(graph_state, arena, result_set, dest)
 
-            if new_path and new_path.similarity(threshold=self.threshold, result_set=result_set):
-                result_set.append(new_path)
+                if new_path and new_path.similarity(threshold=self.threshold, result_set=result_set):
+                    result_set.append(new_path)
+        finally:
+            self.arenas.release(arena)
 
-        return result_set
+        return self.to_labels(result_set)
 
 
     def _generate_initial_paths(
@@ -62,206 +58,160 @@ class FindKSPD_Minus(BasePathFindingAlgorithm):
             shortest_path: Path,
             src: int,
             dest: int,
-            global_pq: List,
-            lq: Dict[int, List[Path]],
-            covered_vertices: Dict,
+            arena: SearchArena,
             graph_state: GraphState
         ) -> None:
 
-        for vertex in shortest_path.route[:-1]:
-            for neighbor in self.graph[vertex]:
-                path = Path()
-                path.route = shortest_path.route[:shortest_path.route.index(vertex)+1]
-
+        # Her sapma yolu shortest_path'in önek düğümlerini paylaşır
+        prefix_nodes = shortest_path.nodes()
+        # Düğümün shortest_path'teki konumu: döngü kontrolleri O(1)
+        position = {v: i for i, v in enumerate(shortest_path.route)}
+        for idx, vertex in enumerate(shortest_path.route[:-1]):
+            for edge, (neighbor, weight) in enumerate(self.graph.successors(vertex), self.graph.offsets[vertex]):
                 should_add = False
 
-                if neighbor not in path.route:
-                    if neighbor in shortest_path.route:
-                        next_idx = shortest_path.route.index(vertex) + 1
-                        if next_idx < len(shortest_path.route) and shortest_path.route[next_idx] != neighbor:
-                            path.route.append(neighbor)
-                            should_add = True
+                neighbor_idx = position.get(neighbor)
+                if neighbor_idx is None:
+                    should_add = True
 
-                    else:
-                        path.route.append(neighbor)
-                        should_add = True
+                elif neighbor_idx > idx + 1:
+                    # Önekte değil ve shortest_path'in bir sonraki kenarı değil
+                    should_add = True
 
                 if should_add:
-                    for i in range(len(path.route)-1):
-                        u, v = path.route[i], path.route[i+1]
-                        path.edges[(u,v)] = self.graph[u][v]['weight']
-                        path.length += self.graph[u][v]['weight']
+                    path = Path(node=prefix_nodes[idx])
+                    path.append(neighbor, weight, edge)
                     path.cls = (1, vertex)
                     path.lb = path.LB1(graph_state)
 
                     tail = path.tail()
-                    if tail not in lq:
-                        lq[tail] = []
-                    heapq.heappush(lq[tail], path)
-                    self.prefix_map.insert(path)
-
-                    if lq[tail] and id(lq[tail]) not in self.global_LQ_ids:
-                        heapq.heappush(global_pq, ((not lq[tail][0].is_active, lq[tail][0].lb), id(lq[tail]), lq[tail]))
-                        self.global_LQ_ids.add(id(lq[tail]))
+                    arena.local_queue(tail).push(path.heap_entry())
+                    arena.prefix_map.insert(path)
+                    self._update_global(arena, tail)
 
 
     def _extend_path(
             self,
             path: Path,
             graph_state: GraphState,
-            lq: Dict[int, List[Path]],
-            global_pq: List,
-            covered_vertices: Dict
+            arena: SearchArena
         ) -> bool:
 
         tail = path.tail()
 
-        if tail in lq:
-            for p in lq[tail]:
-                if p.cls == path.cls and p.length >= path.length and p.is_active:
-                    p.is_active = False
-
-        for neighbor in self.graph[tail]:
-            if neighbor not in path.route and neighbor != graph_state.parent.get(tail):
-                new_path = path.copy()
-                new_path.route.append(neighbor)
+        if tail in arena.lq and arena.lq[tail].deactivate(path.cls, path.length):
+            self._update_global(arena, tail)
 
-                edge_weight = self.graph[tail][neighbor]['weight']
-                new_path.edges[(tail, neighbor)] = edge_weight
-                new_path.length += edge_weight
+        for edge, (neighbor, edge_weight) in enumerate(self.graph.successors(tail), self.graph.offsets[tail]):
+            if neighbor not in path and neighbor != graph_state.parent[tail]:
+                new_path = path.extended(neighbor, edge_weight, edge)
                 new_path.lb = new_path.LB1(graph_state)
 
-                class_key = path.cls
-                if class_key not in covered_vertices:
-                    covered_vertices[class_key] = set()
-
-                if neighbor in covered_vertices[class_key]:
+                covered = arena.covered(path.cls)
+                if neighbor in covered:
                     new_path.is_active = False
                 else:
-                    covered_vertices[class_key].add(neighbor)
+                    covered.add(neighbor)
 
-                if neighbor not in lq:
-                    lq[neighbor] = []
-                heapq.heappush(lq[neighbor], new_path)
-                self.prefix_map.insert(new_path)
+                arena.local_queue(neighbor).push(new_path.heap_entry())
+                arena.prefix_map.insert(new_path)
+                self._update_global(arena, neighbor)
 
 
-        parent = graph_state.parent.get(tail)
+        parent = graph_state.parent[tail]
         if parent is None:
             return False
 
-        if parent in path.route:
-            self.prefix_map.remove(path)
+        if parent in path:
+            arena.prefix_map.remove(path)
             return False
 
-        path.route.append(parent)
-        edge_weight = self.graph[tail][parent]['weight']
-        path.edges[(tail, parent)] = edge_weight
-        path.length += edge_weight
+        edge = self.graph.edge_index(tail, parent)
+        path.append(parent, self.graph.weights[edge], edge)
 
         return True
 
+    @staticmethod
+    def _update_global(arena: SearchArena, vertex: int) -> None:
+        """
+        vertex'in yerel kuyruğunun global_pq anahtarını en iyi aktif yolundan
+        yenile: anahtar onun lb'si; aktif yol kalmadıysa kuyruk global_pq'dan
+        çıkarılır.
+        """
+        head = arena.lq[vertex].head() if vertex in arena.lq else None
+        if head is not None:
+            arena.global_pq.set(vertex, head)
+        else:
+            arena.global_pq.discard(vertex)
+
     def _adjust_path(
         self,
         path: Path,
-        lq: Dict[int, List[Path]],
-        global_pq: List,
+        arena: SearchArena,
         result_set: List[Path],
-        dest: int,
-        prefix_map: PrefixMap
+        dest: int
         ) -> None:
         if path.cls is None:
             return
 
         _, deviation_vertex = path.cls
 
-        updated = False
+        lq = arena.lq
         for vertex in path.route:
-            if vertex in lq:
-                for p in lq[vertex]:
-                    if not p.is_active:
-                        if p.cls == path.cls:
-                            p.is_active = True
-                            updated = True
+            if vertex in lq and lq[vertex].activate(path.cls):
+                self._update_global(arena, vertex)
 
         if path.tail() == dest:
-            path_id = len(result_set) + 1
-
-            for i, vertex in enumerate(path.route):
-                prefix = path.route[:i+1]
-
-                if len(prefix)>1:
-                    paths_with_prefix = self.prefix_map.findPathListWithPrefix(prefix)
-
-                    if paths_with_prefix:
-                        for p in paths_with_prefix:
-                            if len(p.route) > len(prefix):
-                                p.cls = (path_id, vertex)
-
-        if updated:
-            for i in range(len(global_pq)):
-                temp_queue = global_pq[i][2]
-
-                if temp_queue:
-                    first_active = next((p for p in temp_queue if p.is_active), None)
-                    if first_active:
-                        new_key = (not first_active.is_active, first_active.lb)
-                        global_pq[i] = (new_key, global_pq[i][1], temp_queue)
-
-            heapq.heapify(global_pq)
+            # route[:i+1] önekiyle başlayan yolların sınıfı (path_id, route[i])
+            # olur; trie'de route düğümlerine tembel etiket olarak yazılır,
+            # yollar okunurken (resolve_cls) çözülür.
+            arena.prefix_map.tag_route(path.route, len(result_set) + 1)
 
 
     def _find_next_path(
             self,
             graph_state: GraphState,
-            global_pq: List,
-            lq: Dict[int, List[Path]],
+            arena: SearchArena,
             result_set: List[Path],
-            dest: int,
-            covered_vertices: Dict
+            dest: int
         ) -> Optional[Path]:
         self.number_of_paths_explored += 1
 
-        while global_pq:
-            _, _, current_LQ = heapq.heappop(global_pq)
-
-            if not current_LQ:
-                continue
-
-            inactive_paths = []
-            current_path = None
-
-            while current_LQ:
-                candidate = heapq.heappop(current_LQ)
-
-                if candidate.is_active:
-                    current_path = candidate
-                    break
-                else:
-                    inactive_paths.append(candidate)
-
-            for p in inactive_paths:
-                heapq.heappush(current_LQ, p)
-
-            if current_path is None:
-                if current_LQ:
-                    heapq.heappush(global_pq, ((not current_LQ[0].is_active, current_LQ[0].lb), id(current_LQ), current_LQ))
-                continue
-
-            if current_LQ:
-                heapq.heappush(global_pq, ((not current_LQ[0].is_active, current_LQ[0].lb), id(current_LQ), current_LQ))
+        while arena.global_pq:
+            # global_pq'daki kuyrukların başı aktiftir (bkz. _update_global)
+            _, vertex = arena.global_pq.pop()
+            current_LQ = arena.lq[vertex]
+            current_path = current_LQ.pop()
+
+            # Yol kuyruktayken atanmış sınıf etiketlerini uygula
+            arena.prefix_map.resolve_cls(current_path)
+
+            # LB1 heuristic'ten (landmark / CH) geldiyse kuyruğu settle edip kesin
+            # değere yükselt; sınır arttıysa yolu yeniden sıraya koy
+            if graph_state.heuristic is not None:
+                tail = current_path.tail()
+                if not graph_state.isSettled[tail]:
+                    construct_partial_spt(graph_state=graph_state, v=tail)
+                exact = current_path.length + graph_state.distances[tail]
+                if exact > current_path.lb:
+                    current_path.lb = exact
+                    current_LQ.push(current_path.heap_entry())
+                    self._update_global(arena, vertex)
+                    continue
+
+            self._update_global(arena, vertex)
 
             while current_path.tail() != dest:
-                if not self._extend_path(path=current_path, graph_state=graph_state, lq=lq, global_pq=global_pq, covered_vertices=covered_vertices):
+                if not self._extend_path(path=current_path, graph_state=graph_state, arena=arena):
                     break
 
             if current_path.tail() == dest:
-                if current_path.cls in covered_vertices:
-                    covered_vertices[current_path.cls].clear()
+                if current_path.cls in arena.covered_vertices:
+                    arena.covered_vertices[current_path.cls].clear()
 
-                self.prefix_map.remove(current_path)
+                arena.prefix_map.remove(current_path)
 
-                self._adjust_path(path=current_path, global_pq=global_pq, lq=lq, result_set=result_set, dest=dest, prefix_map=self.prefix_map)
+                self._adjust_path(path=current_path, arena=arena, result_set=result_set, dest=dest)
 
                 return current_path
 
@@ -1,14 +1,121 @@
 import heapq
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
 import networkx as nx
-from typing import List, Optional, Tuple, Set
+from typing import List, Optional, Tuple, Set, Union
 
 from .base import BasePathFindingAlgorithm
-from ..core.data_structures import Path
+from ..core.csr_graph import CSRGraph
+from ..core.data_structures import Path, ResultSet
+from ..core.graph_utils import (
+    SPTDistances,
+    _build_path,
+    _path_from_route,
+    astar,
+    bidirectional_dijkstra,
+    construct_partial_spt,
+    spt_route,
+)
+from ..core.prefix_map import PrefixMap
+from ..core.shared_graph import SharedCSRGraph
+
+
+class _Spur:
+    """
+    Ertelenmiş bir spur araması (spur_search="spt"): spur düğümü, root
+    önek düğümü ve üretildiği andaki Yen dışlamaları.
+    """
+
+    __slots__ = ("vertex", "root_node", "root_route", "excluded_nodes", "excluded_edges")
+
+    def __init__(self, vertex, root_node, root_route, excluded_nodes, excluded_edges):
+        self.vertex = vertex
+        self.root_node = root_node
+        self.root_route = root_route
+        self.excluded_nodes = excluded_nodes
+        self.excluded_edges = excluded_edges
+
+
+# Worker sürecindeki algoritma nesnesi (bkz. _init_spur_worker)
+_worker_algorithm = None
+
+
+def _init_spur_worker(spec, spur_search, landmarks, hierarchy):
+    """Worker başına bir kez: paylaşılan grafa bağlan, spur araması için nesne kur."""
+    global _worker_algorithm
+    _worker_algorithm = FindKSPD_Yen(
+        SharedCSRGraph.attach(spec), spur_search=spur_search, landmarks=landmarks, hierarchy=hierarchy
+    )
+
+
+def _spur_route(task) -> Optional[List[int]]:
+    """Worker'da bir spur araması; sonuç yalnızca route olarak döner."""
+    vertex, dest, excluded_nodes, excluded_edges = task
+    spur_path = _worker_algorithm._spur_path(_Spur(vertex, None, None, excluded_nodes, excluded_edges), dest)
+    return spur_path.route if spur_path is not None else None
+
 
 class FindKSPD_Yen(BasePathFindingAlgorithm):
-    def __init__(self, graph: nx.DiGraph, threshold: float = 0.5):
-        super().__init__(graph, threshold)
+    # Spur aramalarında kullanılacak Dijkstra:
+    #   "dijkstra":      tek yönlü (_dijkstra_simple)
+    #   "bidirectional": graph_utils.bidirectional_dijkstra
+    #   "alt":           landmark (ya da CH) alt sınırlarıyla graph_utils.astar
+    #   "spt":           diğer algoritmaların ters SPT'si (GraphState) ile:
+    #                    spur'lar root uzunluğu + d(spur, dest) sınırıyla
+    #                    ertelenir, SPT yolu izinliyse doğrudan kullanılır,
+    #                    değilse kesin SPT mesafeleriyle A*
+    SPUR_SEARCH_METHODS = ("dijkstra", "bidirectional", "alt", "spt")
+
+    def __init__(
+            self,
+            graph: Union[nx.DiGraph, CSRGraph],
+            threshold: float = 0.5,
+            spur_search: str = "dijkstra",
+            spur_workers: Optional[int] = None,
+            **kwargs
+    ):
+        super().__init__(graph, threshold, **kwargs)
         self.number_of_paths_explored = 0
+        # Yapılan spur aramaları ve sapma indeksinden önce kaldığı için
+        # hiç yapılmayan spur aramaları (Lawler)
+        self.number_of_spur_searches = 0
+        self.number_of_spurs_skipped = 0
+
+        if spur_search not in self.SPUR_SEARCH_METHODS:
+            raise ValueError(f"spur_search {self.SPUR_SEARCH_METHODS} değerlerinden biri olmalı")
+        if spur_search == "alt" and self.landmarks is None and self.hierarchy is None:
+            raise ValueError("spur_search='alt' için landmarks ya da hierarchy gerekli")
+        self.spur_search = spur_search
+
+        # spur_workers verilirse bir base path'in spur aramaları bu kadar
+        # süreçli bir havuza dağıtılır; graf paylaşılan bellekten okunur
+        if spur_workers is not None and spur_workers < 1:
+            raise ValueError("spur_workers en az 1 olmalı")
+        if spur_workers is not None and spur_search == "spt":
+            raise ValueError("spur_search='spt' spur'ları tek tek ertelediği için spur_workers ile kullanılamaz")
+        self.spur_workers = spur_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._shared_graph: Optional[SharedCSRGraph] = None
+
+    def _spur_executor(self) -> ProcessPoolExecutor:
+        """Süreç havuzu ilk kullanımda kurulur ve sorgular arasında paylaşılır."""
+        if self._executor is None:
+            self._shared_graph = SharedCSRGraph(self.graph)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.spur_workers,
+                initializer=_init_spur_worker,
+                initargs=(self._shared_graph.spec, self.spur_search, self.landmarks, self.hierarchy)
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Süreç havuzunu kapat ve paylaşılan grafı serbest bırak."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._shared_graph is not None:
+            self._shared_graph.close()
+            self._shared_graph = None
 
     def _dijkstra_simple(self, src: int, dest: int, excluded_nodes: Optional[Set[int]] = None, excluded_edges: Optional[Set[Tuple[int, int]]] = None) -> Optional[Path]:
         """
@@ -18,7 +125,7 @@ class FindKSPD_Yen(BasePathFindingAlgorithm):
         """
         if src == dest:
             path = Path()
-            path.route = [src]
+            path.append(src)
             return path
 
         if excluded_nodes is None:
@@ -26,13 +133,20 @@ class FindKSPD_Yen(BasePathFindingAlgorithm):
         if excluded_edges is None:
             excluded_edges = set()
 
-        distances = {node: float('inf') for node in self.graph.nodes()}
+        # Grafın paylaşılan, generation damgalı dizileri: spur başına |V|
+        # boyutlu ilklendirme yok, maliyet ziyaret edilen düğüm kadar
+        buffers = self.index.search_buffers
+        generation = buffers.begin()
+        distances, previous_nodes, stamp = buffers.distances, buffers.parent, buffers.stamp
+        stamp[src] = generation
         distances[src] = 0
-        previous_nodes = {node: None for node in self.graph.nodes()}
-        heap = [(0, src)]
+        previous_nodes[src] = -1
+        queue = self.index.queue_factory()
+        push, pop = queue.push, queue.pop
+        push((0, src))
 
-        while heap:
-            cost, node = heapq.heappop(heap)
+        while queue:
+            cost, node = pop()
 
             if node == dest:
                 break
@@ -42,38 +156,58 @@ class FindKSPD_Yen(BasePathFindingAlgorithm):
             if node in excluded_nodes:
                 continue
 
-            for neighbor, data in self.graph[node].items():
+            for neighbor, weight in self.graph.successors(node):
                 if neighbor in excluded_nodes:
                     continue
                 if (node, neighbor) in excluded_edges:
                     continue
-                new_cost = cost + data['weight']
-                if new_cost < distances[neighbor]:
+                new_cost = cost + weight
+                if stamp[neighbor] != generation or new_cost < distances[neighbor]:
+                    stamp[neighbor] = generation
                     distances[neighbor] = new_cost
                     previous_nodes[neighbor] = node
-                    heapq.heappush(heap, (new_cost, neighbor))
+                    push((new_cost, neighbor))
 
-        if distances[dest] == float('inf'):
+        if stamp[dest] != generation:
             return None
 
-        path_route = []
-        current = dest
-        while current is not None:
-            path_route.insert(0, current)
-            current = previous_nodes[current]
-
-        if path_route[0] != src:
-            return None
-
-        shortest_path = Path()
-        shortest_path.route = path_route
-        for i in range(len(path_route) - 1):
-            u, v = path_route[i], path_route[i+1]
-            shortest_path.edges[(u, v)] = self.graph[u][v]['weight']
-            shortest_path.length += self.graph[u][v]['weight']
-        shortest_path.lb = shortest_path.length
-
-        return shortest_path
+        return _build_path(self.graph, previous_nodes, dest)
+
+    def _spur_path(self, spur: _Spur, dest: int, graph_state=None) -> Optional[Path]:
+        """spur.vertex'ten dest'e dışlamalara uyan en kısa yol (spur_search'e göre)."""
+        if self.spur_search == "spt":
+            # SPT yolu dışlamalara değmiyorsa kısıtlı grafta da en kısadır
+            route = spt_route(graph_state, spur.vertex, spur.excluded_nodes, spur.excluded_edges)
+            if route is not None:
+                return _path_from_route(self.graph, route)
+            return astar(
+                self.graph, spur.vertex, dest,
+                SPTDistances(graph_state),
+                excluded_nodes=spur.excluded_nodes,
+                excluded_edges=spur.excluded_edges
+            )
+
+        if self.spur_search == "bidirectional":
+            return bidirectional_dijkstra(
+                self.graph, self.index.reverse,
+                spur.vertex, dest,
+                excluded_nodes=spur.excluded_nodes,
+                excluded_edges=spur.excluded_edges
+            )
+
+        if self.spur_search == "alt":
+            return astar(
+                self.graph, spur.vertex, dest,
+                self.heuristic_to(dest),
+                excluded_nodes=spur.excluded_nodes,
+                excluded_edges=spur.excluded_edges
+            )
+
+        return self._dijkstra_simple(
+            spur.vertex, dest,
+            excluded_nodes=spur.excluded_nodes,
+            excluded_edges=spur.excluded_edges
+        )
 
 
     def find_paths(
@@ -94,92 +228,138 @@ class FindKSPD_Yen(BasePathFindingAlgorithm):
             - seen_routes (set) ile O(1) duplicate kontrolü
             - Klasik Yen akışı: sadece pop edilen path'in spur'ları işlenir
             - excluded_edges kullanımı (node silmek yerine edge silmek)
+            - Lawler: her candidate sapma indeksini (üretildiği spur'un
+              indeksi) taşır; pop edildiğinde yalnızca o indeksten
+              itibaren spur üretilir. Daha önceki spur'lar, öneki paylaşan
+              atası tarafından zaten üretilmiştir. Atlanan aramalar
+              number_of_spurs_skipped'te sayılır.
+
+        spur_search="spt" iken spur aramaları hemen yapılmaz: her spur
+        root uzunluğu + d(spur, dest) alt sınırıyla candidates'a girer ve
+        ancak pop edildiğinde aranır. Sınırı mevcut en iyi candidate'tan
+        büyük spur'lar hiç aranmadan kalır.
+
+        spur_workers verilirse bir base path'in spur aramaları süreç
+        havuzunda paralel yapılır; sonuçlar spur sırasıyla eklendiği için
+        çıktı tek süreçli aramayla aynıdır.
         """
         self.validate_parameters(src, dest, k)
+        src, dest = self.to_internal(src, dest)
 
         self.number_of_paths_explored = 0
+        self.number_of_spur_searches = 0
+        self.number_of_spurs_skipped = 0
 
-        P1 = self._dijkstra_simple(src, dest)
+        graph_state = self.index.spt_cache.get(dest) if self.spur_search == "spt" else None
+
+        P1 = self.find_first_path(src, dest, graph_state)
         if P1 is None:
-            print(f"No path exists between {src} and {dest}")
+            print(f"No path exists between {self.graph.node_label(src)} and {self.graph.node_label(dest)}")
             return []
 
-        result_set = [P1]
+        result_set = ResultSet([P1])
 
         # Yen'in A listesi: candidates'dan pop edilen + ilk path
-        # (diversity filtresinden bağımsız olarak her pop buraya girer)
-        accepted_paths = [P1]
+        # (diversity filtresinden bağımsız olarak her pop buraya girer).
+        # Route trie'sinde tutulur: bir root önekinden çıkan accepted
+        # kenarlar, önek düğümünün çocuklarıdır
+        accepted_paths = PrefixMap()
+        accepted_paths.insert(P1)
 
         # O(1) duplicate kontrolü: candidates'a eklenmiş veya zaten
         # accepted olan tüm route'ların tuple hali
         seen_routes = {tuple(P1.route)}
-        candidates = []  # min-heap
+        # min-heap: (lb, sıra no, path ya da _Spur, sapma indeksi); eşitlikte öğeye inmez
+        candidates = []
+        order = count()
+
+        def add_spur(spur, spur_path):
+            """spur'un en kısa yolunu root ile birleştirip candidate yap."""
+            if spur_path is None:
+                return
+
+            self.number_of_paths_explored += 1
+            total_route = spur.root_route[:-1] + spur_path.route
+            route_key = tuple(total_route)
+
+            if route_key in seen_routes:
+                return  # O(1) duplicate kontrolü
 
-        def generate_spurs(base_path):
-            """base_path'in her spur node'undan yeni candidate'lar üret."""
+            seen_routes.add(route_key)
 
+            total_path = Path(node=spur.root_node)
+            for spur_vertex_node in spur_path.nodes()[1:]:
+                total_path.append(spur_vertex_node.vertex, spur_vertex_node.weight, spur_vertex_node.edge)
+            total_path.lb = total_path.length
+
+            deviation = len(spur.root_route) - 1
+            heapq.heappush(candidates, (total_path.lb, next(order), total_path, deviation))
+
+        def generate_spurs(base_path, deviation):
+            """base_path'in sapma indeksinden itibaren her spur node'undan yeni candidate'lar üret."""
+
+            base_nodes = base_path.nodes()
+            # base_path accepted olduğu için her root öneki trie'de vardır
+            prefix = accepted_paths.root
+            spurs = []
             for i in range(len(base_path.route) - 1):
                 spur_node = base_path.route[i]
+                prefix = prefix.child(spur_node)
+                if i < deviation:
+                    continue
                 root_route = base_path.route[:i + 1]
 
-                # Root path nesnesini oluştur
-                root_path_obj = Path()
-                root_path_obj.route = root_route.copy()
-                for j in range(len(root_route) - 1):
-                    u, v = root_route[j], root_route[j + 1]
-                    root_path_obj.edges[(u, v)] = self.graph[u][v]['weight']
-                    root_path_obj.length += self.graph[u][v]['weight']
+                # Root path, base_path'in önek düğümünü paylaşır
+                root_node = base_nodes[i]
 
                 # Aynı root prefix'e sahip accepted path'lerde
                 # spur_node'dan çıkan edge'leri yasakla (Yen kuralı)
-                excluded_edges = set()
-                for path in accepted_paths:
-                    if (len(path.route) > i and
-                            path.route[:i + 1] == root_route and
-                            i + 1 < len(path.route)):
-                        excluded_edges.add((path.route[i], path.route[i + 1]))
+                excluded_edges = {(spur_node, vertex) for vertex in prefix.children}
 
                 # Root prefix'teki node'ları (spur_node hariç) yasakla
                 excluded_nodes = set(root_route[:-1])
 
-                spur_path = self._dijkstra_simple(
-                    spur_node, dest,
-                    excluded_nodes=excluded_nodes,
-                    excluded_edges=excluded_edges
-                )
-
-                if spur_path is None:
+                spur = _Spur(spur_node, root_node, root_route, excluded_nodes, excluded_edges)
+                if graph_state is None:
+                    spurs.append(spur)
                     continue
 
-                self.number_of_paths_explored += 1
-                total_route = root_path_obj.route[:-1] + spur_path.route
-                route_key = tuple(total_route)
-
-                if route_key in seen_routes:
-                    continue  # O(1) duplicate kontrolü
-
-                seen_routes.add(route_key)
-
-                total_path = Path()
-                total_path.route = total_route
-                total_path.edges = root_path_obj.edges.copy()
-                total_path.edges.update(spur_path.edges)
-                total_path.length = root_path_obj.length + spur_path.length
-                total_path.lb = total_path.length
-
-                heapq.heappush(candidates, (total_path.lb, total_path))
+                # Spur yolu en az d(spur, dest) uzunluğundadır; arama, bu
+                # sınır candidates'ın başına gelene kadar ertelenir
+                distance = construct_partial_spt(graph_state=graph_state, v=spur_node)
+                if distance == float('inf'):
+                    continue
+                heapq.heappush(candidates, (root_node.length + distance, next(order), spur, i))
+
+            self.number_of_spurs_skipped += min(deviation, len(base_path.route) - 1)
+            self.number_of_spur_searches += len(spurs)
+            if self.spur_workers is None:
+                for spur in spurs:
+                    add_spur(spur, self._spur_path(spur, dest))
+                return
+
+            # Aramalar birbirinden bağımsız; map sonuçları spur sırasıyla
+            # döndürür, candidates'a ekleme sırası deterministiktir
+            tasks = [(spur.vertex, dest, spur.excluded_nodes, spur.excluded_edges) for spur in spurs]
+            chunksize = max(1, len(tasks) // (4 * self.spur_workers))
+            for spur, route in zip(spurs, self._spur_executor().map(_spur_route, tasks, chunksize=chunksize)):
+                add_spur(spur, _path_from_route(self.graph, route) if route is not None else None)
 
         # İlk path'ten spur'ları üret
-        generate_spurs(P1)
+        generate_spurs(P1, 0)
 
         while len(result_set) < k and candidates:
-            _, current_path = heapq.heappop(candidates)
+            _, _, current_path, deviation = heapq.heappop(candidates)
+            if isinstance(current_path, _Spur):
+                self.number_of_spur_searches += 1
+                add_spur(current_path, self._spur_path(current_path, dest, graph_state))
+                continue
 
-            accepted_paths.append(current_path)
-            generate_spurs(current_path)
+            accepted_paths.insert(current_path)
+            generate_spurs(current_path, deviation)
 
             # Diversity kontrolü — sadece result_set eklemesi için
             if current_path.similarity(self.threshold, result_set):
                 result_set.append(current_path)
 
-        return result_set
\ No newline at end of file
+        return self.to_labels(result_set)
\ No newline at end of file
@@ -1,12 +1,46 @@
-from .data_structures import GraphState, Path
-from .graph_utils import reverse, dijkstra, construct_partial_spt
+from .contraction_hierarchy import ContractionHierarchy
+from .csr_graph import CSRGraph
+from .data_structures import GraphState, Path, ResultSet
+from .graph_index import GraphIndex
+from .graph_utils import (
+    reverse,
+    dijkstra,
+    bidirectional_dijkstra,
+    astar,
+    construct_partial_spt,
+    shortest_path_from_spt,
+)
+from .landmarks import LandmarkIndex
+from .local_queue import LocalQueue
 from .prefix_map import PrefixMap
+from .priority_queue import BinaryHeap, BucketQueue, IndexedHeap, RadixHeap, select_queue
+from .search_arena import SearchArena, SearchArenaPool
+from .shared_graph import SharedCSRGraph
+from .spt_cache import SPTCache
 
 __all__ = [
+    "CSRGraph",
+    "ContractionHierarchy",
     "GraphState",
     "Path",
+    "ResultSet",
+    "GraphIndex",
     "reverse",
     "dijkstra",
+    "bidirectional_dijkstra",
+    "astar",
     "construct_partial_spt",
-    "PrefixMap"
+    "shortest_path_from_spt",
+    "LandmarkIndex",
+    "LocalQueue",
+    "PrefixMap",
+    "BinaryHeap",
+    "BucketQueue",
+    "IndexedHeap",
+    "RadixHeap",
+    "select_queue",
+    "SearchArena",
+    "SearchArenaPool",
+    "SharedCSRGraph",
+    "SPTCache"
 ]
\ No newline at end of file
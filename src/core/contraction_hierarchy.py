@@ -0,0 +1,264 @@
+import heapq
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .csr_graph import CSRGraph, _to_array
+from .graph_index import GraphIndex
+from .priority_queue import BinaryHeap
+
+
+class CHDistanceOracle:
+    """
+    Sabit bir hedef için kesin d(v, target) sorguları.
+
+    Hedefin geriye doğru yukarı arama uzayı bir kez hesaplanır; her v için
+    yalnızca v'den yukarı arama yapılır ve sonuç saklanır. oracle[v] ile
+    erişildiği için GraphState.heuristic olarak doğrudan kullanılabilir
+    (kesin mesafe tutarlı bir alt sınırdır).
+    """
+
+    def __init__(self, hierarchy: "ContractionHierarchy", target: int):
+        self.hierarchy = hierarchy
+        self.target = target
+        self.backward = hierarchy._upward_search(hierarchy.down, target)
+        self._distances: Dict[int, float] = {target: 0.0}
+
+    def __getitem__(self, v: int) -> float:
+        distance = self._distances.get(v)
+        if distance is None:
+            distance = self.hierarchy._meet(v, self.backward)
+            self._distances[v] = distance
+        return distance
+
+    def __len__(self) -> int:
+        return self.hierarchy.number_of_nodes()
+
+
+class ContractionHierarchy:
+    """
+    Contraction Hierarchies ön işlemesi: kesin d(u, v) sorguları.
+
+    Düğümler önem sırasına göre (edge difference) birer birer çıkarılır;
+    çıkarılan v üzerinden geçen ve tanıklı (witness) daha kısa yolu olmayan
+    her u -> v -> x için u -> x kısayolu eklenir. Sonuçta
+
+        up:   rank[u] < rank[v] olan u -> v kenarları
+        down: rank[u] > rank[v] olan u -> v kenarlarının tersi (v -> u)
+
+    iki CSR'de tutulur. d(s, t), s'den up ve t'den down üzerinde yalnızca
+    yukarı doğru yapılan iki küçük aramanın buluştuğu düğümlerden okunur.
+    İndeks bir kez kurulup save() ile sıkıştırılmış .npz dosyasına yazılır.
+    """
+
+    def __init__(self, rank: np.ndarray, up: CSRGraph, down: CSRGraph):
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self._oracles: "OrderedDict[int, CHDistanceOracle]" = OrderedDict()
+        self.max_cached_oracles = 16
+
+    @classmethod
+    def build(
+            cls,
+            graph: CSRGraph,
+            witness_settle_limit: int = 50
+    ) -> "ContractionHierarchy":
+        """
+        graph'ın hiyerarşisini kur.
+
+        witness_settle_limit: tanık aramasında settle edilecek en fazla düğüm.
+        Sınır aşılırsa kısayol (gereksiz de olsa) eklenir; sonuçlar yine kesindir.
+        """
+        n = graph.number_of_nodes()
+        out_edges: List[Dict[int, float]] = [{} for _ in range(n)]
+        in_edges: List[Dict[int, float]] = [{} for _ in range(n)]
+
+        for u in range(n):
+            for v, w in graph.successors(u):
+                if u != v and w < out_edges[u].get(v, float('inf')):
+                    out_edges[u][v] = w
+                    in_edges[v][u] = w
+
+        contracted = [False] * n
+        contracted_neighbors = [0] * n
+        rank = np.zeros(n, dtype=np.int32)
+        up_edges: List[Tuple[int, int, float]] = []
+        down_edges: List[Tuple[int, int, float]] = []
+
+        def witness_distances(u, v, limit, targets):
+            """v'yi kullanmadan u'dan en çok limit uzaklıktaki mesafeler."""
+            distances = {u: 0.0}
+            # Kısayol ağırlıkları grafın en büyük kenar ağırlığını aşar; grafa
+            # göre boyutlanan BucketQueue'da anahtarlar sarar, sıra bozulur
+            queue = BinaryHeap()
+            queue.push((0.0, u))
+            settled = 0
+            remaining = len(targets)
+            while queue and settled < witness_settle_limit:
+                cost, node = queue.pop()
+                if cost > distances[node]:
+                    continue
+                if cost > limit:
+                    break
+                settled += 1
+                if node in targets:
+                    remaining -= 1
+                    if remaining == 0:
+                        break
+                for neighbor, w in out_edges[node].items():
+                    if neighbor == v:
+                        continue
+                    new_cost = cost + w
+                    if new_cost < distances.get(neighbor, float('inf')):
+                        distances[neighbor] = new_cost
+                        queue.push((new_cost, neighbor))
+            return distances
+
+        def shortcuts(v):
+            """v çıkarılırsa gereken (u, x, ağırlık) kısayolları."""
+            result = []
+            if not out_edges[v]:
+                return result
+            max_out = max(out_edges[v].values())
+            for u, w_in in in_edges[v].items():
+                distances = witness_distances(u, v, w_in + max_out, out_edges[v])
+                for x, w_out in out_edges[v].items():
+                    if x == u:
+                        continue
+                    via = w_in + w_out
+                    if distances.get(x, float('inf')) > via:
+                        result.append((u, x, via))
+            return result
+
+        def priority(v, needed):
+            return len(needed) - len(in_edges[v]) - len(out_edges[v]) + contracted_neighbors[v]
+
+        heap = [(priority(v, shortcuts(v)), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contracted[v]:
+                continue
+
+            # Tembel güncelleme: öncelik değiştiyse ve artık en küçük değilse geri koy
+            needed = shortcuts(v)
+            current = priority(v, needed)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+
+            for u, x, w in needed:
+                if w < out_edges[u].get(x, float('inf')):
+                    out_edges[u][x] = w
+                    in_edges[x][u] = w
+
+            for x, w in out_edges[v].items():
+                up_edges.append((v, x, w))
+                del in_edges[x][v]
+                contracted_neighbors[x] += 1
+            for u, w in in_edges[v].items():
+                down_edges.append((v, u, w))
+                del out_edges[u][v]
+                contracted_neighbors[u] += 1
+
+            out_edges[v], in_edges[v] = {}, {}
+            contracted[v] = True
+            rank[v] = order
+            order += 1
+
+        return cls(
+            rank,
+            CSRGraph.from_edges(up_edges, num_nodes=n),
+            CSRGraph.from_edges(down_edges, num_nodes=n),
+        )
+
+    def save(self, filename: str) -> None:
+        np.savez_compressed(
+            filename,
+            rank=self.rank,
+            up_offsets=np.frombuffer(self.up.offsets, dtype=np.int64),
+            up_targets=np.frombuffer(self.up.targets, dtype=np.int32),
+            up_weights=np.frombuffer(self.up.weights, dtype=np.float64),
+            down_offsets=np.frombuffer(self.down.offsets, dtype=np.int64),
+            down_targets=np.frombuffer(self.down.targets, dtype=np.int32),
+            down_weights=np.frombuffer(self.down.weights, dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "ContractionHierarchy":
+        with np.load(filename) as data:
+            def csr(prefix):
+                return CSRGraph(
+                    _to_array('q', data[prefix + "_offsets"]),
+                    _to_array('i', data[prefix + "_targets"]),
+                    _to_array('d', data[prefix + "_weights"]),
+                )
+            return cls(data["rank"], csr("up"), csr("down"))
+
+    def number_of_nodes(self) -> int:
+        return self.up.number_of_nodes()
+
+    @staticmethod
+    def _upward_search(graph: CSRGraph, src: int) -> Dict[int, float]:
+        """src'den yalnızca yukarı kenarlarla tam Dijkstra (arama uzayı küçüktür)."""
+        distances = {src: 0.0}
+        queue = GraphIndex.of(graph).queue_factory()
+        queue.push((0.0, src))
+        while queue:
+            cost, node = queue.pop()
+            if cost > distances[node]:
+                continue
+            for neighbor, w in graph.successors(node):
+                new_cost = cost + w
+                if new_cost < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_cost
+                    queue.push((new_cost, neighbor))
+        return distances
+
+    def _meet(self, src: int, backward: Dict[int, float]) -> float:
+        """src'den yukarı arama; hedefin geri arama uzayıyla buluşan en kısa mesafe."""
+        best = float('inf')
+        distances = {src: 0.0}
+        queue = GraphIndex.of(self.up).queue_factory()
+        queue.push((0.0, src))
+        while queue:
+            cost, node = queue.pop()
+            if cost >= best:
+                break
+            if cost > distances[node]:
+                continue
+            other = backward.get(node)
+            if other is not None and cost + other < best:
+                best = cost + other
+            for neighbor, w in self.up.successors(node):
+                new_cost = cost + w
+                if new_cost < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_cost
+                    queue.push((new_cost, neighbor))
+        return best
+
+    def distance(self, src: int, dest: int) -> float:
+        """Kesin d(src, dest); yol yoksa inf."""
+        if src == dest:
+            return 0.0
+        return self._meet(src, self._upward_search(self.down, dest))
+
+    def distances_to(self, dest: int) -> CHDistanceOracle:
+        """
+        dest için d(v, dest) oracle'ı. Hedef başına bir kez kurulur ve küçük
+        bir LRU'da tutulur; LB1 / CompLB için GraphState.heuristic olarak verilir.
+        """
+        oracle = self._oracles.get(dest)
+        if oracle is not None:
+            self._oracles.move_to_end(dest)
+            return oracle
+
+        oracle = CHDistanceOracle(self, dest)
+        self._oracles[dest] = oracle
+        if len(self._oracles) > self.max_cached_oracles:
+            self._oracles.popitem(last=False)
+        return oracle
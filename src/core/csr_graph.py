@@ -0,0 +1,279 @@
+import numbers
+from array import array
+from typing import Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+
+def _to_array(typecode: str, values) -> array:
+    """numpy dizisini sıkıştırılmış bir array.array'e kopyala."""
+    out = array(typecode)
+    out.frombytes(np.ascontiguousarray(values, dtype=np.dtype(typecode)).tobytes())
+    return out
+
+
+class CSRGraph:
+    """
+    Sıkıştırılmış (CSR) yönlü graf.
+
+    Düğümler 0..n-1 arası yoğun tamsayı id'leridir. u'nun çıkış kenarları
+    targets[offsets[u]:offsets[u+1]] ve weights[...] dilimlerindedir; ters
+    graf da aynı biçimde reverse_* dizilerinde tutulur (tembel kurulur).
+
+    labels None değilse id -> orijinal düğüm etiketi eşlemesini tutar
+    (networkx grafındaki düğümler tamsayı değilse).
+    """
+
+    def __init__(
+            self,
+            offsets: array,
+            targets: array,
+            weights: array,
+            labels: Optional[List[Hashable]] = None
+    ):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.labels = labels
+        self._ids = {label: i for i, label in enumerate(labels)} if labels is not None else None
+
+        # Ters CSR ilk ihtiyaç duyulduğunda bir kez kurulur (bkz. reverse())
+        self._reversed: Optional["CSRGraph"] = None
+        # Paylaşılan GraphIndex (bkz. GraphIndex.of)
+        self._index = None
+
+    @staticmethod
+    def _transpose(offsets: array, targets: array, weights: array) -> Tuple[array, array, array]:
+        n = len(offsets) - 1
+        sources = np.repeat(
+            np.arange(n, dtype=np.int32),
+            np.diff(np.frombuffer(offsets, dtype=np.int64))
+        )
+        heads = np.frombuffer(targets, dtype=np.int32)
+        order = np.argsort(heads, kind='stable')
+
+        counts = np.bincount(heads, minlength=n)
+        reverse_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=reverse_offsets[1:])
+
+        return (
+            _to_array('q', reverse_offsets),
+            _to_array('i', sources[order]),
+            _to_array('d', np.frombuffer(weights, dtype=np.float64)[order]),
+        )
+
+    @classmethod
+    def from_edges(
+            cls,
+            edges: Iterable[Tuple[int, int, float]],
+            num_nodes: Optional[int] = None
+    ) -> "CSRGraph":
+        """
+        (u, v, weight) üçlülerinden graf kur. u ve v negatif olmayan
+        tamsayı id'ler olmalı. Tekrarlanan kenarlarda nx.DiGraph.add_edge
+        gibi son ağırlık geçerlidir.
+        """
+        us, vs, ws = array('q'), array('q'), array('d')
+        for u, v, w in edges:
+            us.append(u)
+            vs.append(v)
+            ws.append(w)
+
+        return cls._from_arrays(
+            np.frombuffer(us, dtype=np.int64),
+            np.frombuffer(vs, dtype=np.int64),
+            np.frombuffer(ws, dtype=np.float64),
+            num_nodes
+        )
+
+    @classmethod
+    def from_file(cls, filename: str) -> "CSRGraph":
+        """
+        examples/ altındaki veri setleri ile aynı formatta kenar listesi oku:
+        "u v w" (ağırlıklı) veya "u v" (ağırlıksız, ağırlık 1).
+        """
+        def edges():
+            with open(filename) as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 3:
+                        yield int(parts[0]), int(parts[1]), float(parts[2])
+                    elif len(parts) == 2:
+                        yield int(parts[0]), int(parts[1]), 1
+                    else:
+                        raise ValueError("Unexpected line format in graph file.")
+
+        return cls.from_edges(edges())
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph, weight: str = 'weight') -> "CSRGraph":
+        """
+        nx.DiGraph'ı CSR'a çevir. Düğümler tam olarak 0..n-1 tamsayılarıysa
+        id olarak aynen kullanılır, aksi halde (boşluklu id'ler dahil)
+        yeniden numaralandırılır; böylece grafta olmayan düğüm oluşmaz.
+        Komşu sırası networkx'teki ile aynı kalır.
+        """
+        nodes = list(graph.nodes())
+        labels = None
+
+        if nodes and all(isinstance(node, numbers.Integral) and 0 <= node < len(nodes) for node in nodes):
+            # networkx düğümleri tekil: hepsi [0, n) aralığındaysa küme tam 0..n-1
+            nodes = [int(node) for node in nodes]
+            n = len(nodes)
+            ids = None
+        else:
+            n = len(nodes)
+            labels = nodes
+            ids = {label: i for i, label in enumerate(nodes)}
+
+        counts = np.zeros(n + 1, dtype=np.int64)
+        targets = array('i')
+        weights = array('d')
+        adjacency = graph.adj
+
+        for u in nodes:
+            u_id = u if ids is None else ids[u]
+            neighbors = adjacency[u]
+            counts[u_id + 1] = len(neighbors)
+
+            for v, data in neighbors.items():
+                targets.append(v if ids is None else ids[v])
+                weights.append(data.get(weight, 1))
+
+        # networkx sırası ile id sırası farklı olabilir -> kenarları id'ye göre grupla
+        if ids is None and nodes != sorted(nodes):
+            node_ids = np.array(nodes, dtype=np.int64)
+            sources = np.repeat(node_ids, counts[node_ids + 1])
+            order = np.argsort(sources, kind='stable')
+            targets = _to_array('i', np.frombuffer(targets, dtype=np.int32)[order])
+            weights = _to_array('d', np.frombuffer(weights, dtype=np.float64)[order])
+
+        offsets = np.cumsum(counts)
+        return cls(_to_array('q', offsets), targets, weights, labels)
+
+    @classmethod
+    def _from_arrays(
+            cls,
+            us: np.ndarray,
+            vs: np.ndarray,
+            ws: np.ndarray,
+            num_nodes: Optional[int]
+    ) -> "CSRGraph":
+        m = len(us)
+        if m and (us.min() < 0 or vs.min() < 0):
+            raise ValueError("Vertex id'leri negatif olamaz")
+
+        n = int(max(us.max(), vs.max()) + 1) if m else 0
+        if num_nodes is not None:
+            if num_nodes < n:
+                raise ValueError("num_nodes en büyük vertex id'sinden küçük")
+            n = num_nodes
+
+        # (u, v, girdi sırası) ile sırala, tekrarlanan (u, v) çiftlerini birleştir
+        position = np.arange(m, dtype=np.int64)
+        order = np.lexsort((position, vs, us))
+        us, vs, ws, position = us[order], vs[order], ws[order], position[order]
+
+        if m:
+            new_pair = np.ones(m, dtype=bool)
+            new_pair[1:] = (us[1:] != us[:-1]) | (vs[1:] != vs[:-1])
+            last_of_pair = np.ones(m, dtype=bool)
+            last_of_pair[:-1] = new_pair[1:]
+
+            ws = ws[last_of_pair]
+            us, vs, position = us[new_pair], vs[new_pair], position[new_pair]
+
+        # Her düğümün komşularını girdi sırasında tut
+        order = np.lexsort((position, us))
+        us, vs, ws = us[order], vs[order], ws[order]
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(us, minlength=n), out=offsets[1:])
+
+        return cls(_to_array('q', offsets), _to_array('i', vs), _to_array('d', ws))
+
+    def reverse(self) -> "CSRGraph":
+        """
+        Kenar yönleri ters çevrilmiş graf. Ters CSR ilk çağrıda kurulup
+        saklanır; sonraki çağrılar aynı nesneyi döndürür. İki graf dizileri
+        paylaşır, yani reverse().reverse() is self.
+        """
+        if self._reversed is None:
+            reversed_graph = CSRGraph.__new__(CSRGraph)
+            reversed_graph.labels = self.labels
+            reversed_graph._ids = self._ids
+            reversed_graph.offsets, reversed_graph.targets, reversed_graph.weights = self._transpose(
+                self.offsets, self.targets, self.weights
+            )
+            reversed_graph._reversed = self
+            reversed_graph._index = None
+            self._reversed = reversed_graph
+        return self._reversed
+
+    @property
+    def reverse_offsets(self) -> array:
+        return self.reverse().offsets
+
+    @property
+    def reverse_targets(self) -> array:
+        return self.reverse().targets
+
+    @property
+    def reverse_weights(self) -> array:
+        return self.reverse().weights
+
+    def number_of_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    def number_of_edges(self) -> int:
+        return len(self.targets)
+
+    def __len__(self) -> int:
+        return self.number_of_nodes()
+
+    def __contains__(self, node) -> bool:
+        """Orijinal düğüm etiketine göre üyelik kontrolü."""
+        if self._ids is not None:
+            return node in self._ids
+        return isinstance(node, numbers.Integral) and 0 <= node < self.number_of_nodes()
+
+    def nodes(self) -> range:
+        return range(self.number_of_nodes())
+
+    def successors(self, u: int) -> Iterator[Tuple[int, float]]:
+        """u'nun çıkış kenarları: (komşu, ağırlık) çiftleri."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def predecessors(self, v: int) -> Iterator[Tuple[int, float]]:
+        """v'ye giren kenarlar: (komşu, ağırlık) çiftleri."""
+        return self.reverse().successors(v)
+
+    def out_degree(self, u: int) -> int:
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def edge_index(self, u: int, v: int) -> int:
+        """(u, v) kenarının targets/weights dizisindeki konumu."""
+        try:
+            return self.targets.index(v, self.offsets[u], self.offsets[u + 1])
+        except ValueError:
+            raise KeyError((u, v)) from None
+
+    def has_edge(self, u: int, v: int) -> bool:
+        try:
+            self.edge_index(u, v)
+        except KeyError:
+            return False
+        return True
+
+    def weight(self, u: int, v: int) -> float:
+        return self.weights[self.edge_index(u, v)]
+
+    def node_id(self, label: Hashable) -> int:
+        """Orijinal düğüm etiketinden yoğun id'ye."""
+        return int(label) if self._ids is None else self._ids[label]
+
+    def node_label(self, node: int) -> Hashable:
+        """Yoğun id'den orijinal düğüm etiketine."""
+        return node if self.labels is None else self.labels[node]
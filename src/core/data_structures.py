@@ -1,58 +1,242 @@
-import heapq
-from typing import Dict, List, Optional, Tuple, Set
-from dataclasses import dataclass, field
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple, Set
+from itertools import count
+
+import numpy as np
+
+from .graph_index import GraphIndex
 
 class GraphState:
     def __init__(self, graph_reverse, destination):
         self.graph_reverse = graph_reverse
         self.destination = destination
-        self.distances = {}
-        self.isSettled = {}
-        self.parent = {}
-        self.PQ = []
+        # Ağırlıklara göre seçilen öncelik kuyruğu (bkz. select_queue)
+        self.PQ = GraphIndex.of(graph_reverse).queue_factory()
 
-        for node in graph_reverse.nodes():
-            self.distances[node] = float('inf')
-            self.isSettled[node] = False
-            self.parent[node] = None
+        # Diziler her sorguda yeniden doldurulmaz: graf başına ayrılmış
+        # havuzdan alınır, önceki sorgunun dokunduğu düğümler sıfırlanır.
+        pool = GraphIndex.of(graph_reverse).spt_pool
+        buffers = pool.acquire()
+        self.generation = buffers.generation
+        self.distances = buffers.distances
+        self.isSettled = buffers.isSettled
+        self.parent = buffers.parent
+        self.touched = buffers.touched
+        self._buffers = buffers
+        self._release = weakref.finalize(self, pool.release, buffers)
 
-        heapq.heappush(self.PQ, (0, destination))
+        # İsteğe bağlı h[v] <= d(v, destination) dizisi (ALT) ya da kesin
+        # mesafe oracle'ı (CH). Verilirse LB1 settle edilmemiş düğümler için
+        # SPT'yi büyütmek yerine onu kullanır.
+        self.heuristic = None
+
+        self.PQ.push((0, destination))
         self.distances[destination] = 0
+        self.touched.append(destination)
+
+    def is_valid(self) -> bool:
+        """Diziler hâlâ bu GraphState'e mi ait (havuza geri verilmedi mi)?"""
+        return self._release.alive and self._buffers.generation == self.generation
+
+    def release(self) -> None:
+        """Dizileri havuza geri ver. GraphState çöp toplandığında otomatik çağrılır."""
+        self._release()
+
+
+# Path.heap_entry sıra numaraları
+_entry_sequence = count()
+
+# (not is_active, lb, sıra no, yol); bkz. Path.heap_entry
+HeapEntry = Tuple[bool, float, int, "Path"]
+
+
+class PathNode:
+    """
+    Paylaşılan önek ağacında bir düğüm: (vertex, gelen kenarın ağırlığı,
+    kümülatif uzunluk, gelen kenarın id'si) ve bir önceki düğüme işaretçi.
+    Aynı önekten türeyen yollar önek düğümlerini paylaşır; bir yolu
+    uzatmak O(1)'dir.
+
+    Kenar id'si, kenarın CSR targets / weights dizisindeki konumudur
+    (CSRGraph.edge_index); ilk düğümde -1.
+    """
+
+    __slots__ = ("vertex", "weight", "length", "edge", "parent")
+
+    def __init__(self, vertex: int, weight: float = 0.0, parent: Optional["PathNode"] = None, edge: int = -1):
+        self.vertex = vertex
+        self.weight = weight
+        self.length = parent.length + weight if parent is not None else 0.0
+        self.edge = edge
+        self.parent = parent
 
 
-@dataclass
 class Path:
-    route: List[int] = field(default_factory=list)
-    edges: Dict[Tuple[int, int], float] = field(default_factory=dict)
-    length: float = 0.0
-    lb: float = 0.0
-    cls: Optional[Tuple] = None
-    is_active: bool = True
-    cached_intersections: Dict[int, float] = field(default_factory=dict)
+    """
+    Kalıcı (persistent) yol: yalnızca son düğümün PathNode'unu tutar.
+
+    route, edges ve döngü kontrolü için düğüm kümesi ilk erişimde düğüm
+    zincirinden bir kez kurulur; yol yerinde uzatıldıkça (append) artımlı
+    güncellenir. Aday yollar için çoğunlukla hiç kurulmazlar; LB2 /
+    benzerlik sayaçları da ilk kullanımda ayrılır. __slots__ sayesinde
+    bir aday yol yalnızca birkaç işaretçi tutar.
+    """
+
+    __slots__ = (
+        "node", "lb", "cls", "is_active", "cached_intersections",
+        "prefix_node", "cls_stamp",
+        "_route", "_edges", "_members", "_overlap", "_overlap_node",
+    )
+
+    def __init__(
+            self,
+            node: Optional[PathNode] = None,
+            lb: float = 0.0,
+            cls: Optional[Tuple] = None,
+            is_active: bool = True
+    ):
+        self.node = node
+        self.lb = lb
+        self.cls = cls
+        self.is_active = is_active
+        # cached_intersections[i]: LB2'nin result_set[i] için kullandığı
+        # ortak uzunluk (bkz. LB2); ilk LB2 çağrısına kadar None
+        self.cached_intersections: Optional[List[float]] = None
+        # PrefixMap'teki düğümü ve cls'in çözüldüğü etiket damgası
+        # (bkz. PrefixMap.resolve_cls); haritada değilse None
+        self.prefix_node = None
+        self.cls_stamp = 0
+        self._route: Optional[List[int]] = None
+        self._edges: Optional[Dict[Tuple[int, int], float]] = None
+        self._members: Optional[Set[int]] = None
+        # _overlap[i]: result_set[i] ile ortak kenar uzunluğu, _overlap_node'a kadar sayılmış
+        self._overlap: Optional[List[float]] = None
+        self._overlap_node: Optional[PathNode] = None
+
+    @classmethod
+    def from_route(cls, route: List[int], graph) -> "Path":
+        """graph (CSRGraph) üzerindeki route'tan yol kur."""
+        path = cls()
+        for i, vertex in enumerate(route):
+            if i:
+                edge = graph.edge_index(route[i - 1], vertex)
+                path.append(vertex, graph.weights[edge], edge)
+            else:
+                path.append(vertex)
+        return path
+
+    @property
+    def route(self) -> List[int]:
+        if self._route is None:
+            self._route = [node.vertex for node in self.nodes()]
+        return self._route
+
+    @property
+    def edges(self) -> Dict[Tuple[int, int], float]:
+        if self._edges is None:
+            self._edges = {
+                (node.parent.vertex, node.vertex): node.weight
+                for node in self.nodes() if node.parent is not None
+            }
+        return self._edges
+
+    @property
+    def length(self) -> float:
+        return self.node.length if self.node is not None else 0.0
+
+    def edge_ids(self) -> np.ndarray:
+        """Yolun kenar id'leri, sıralı int32 dizisi (benzerlik için)."""
+        return np.sort(np.fromiter(
+            (node.edge for node in self.nodes() if node.parent is not None), dtype=np.int32
+        ))
+
+    def nodes(self) -> List[PathNode]:
+        """Baştan sona PathNode listesi."""
+        nodes = []
+        node = self.node
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return nodes
+
+    def __repr__(self):
+        return f"Path(route={self.route}, length={self.length}, lb={self.lb}, cls={self.cls}, is_active={self.is_active})"
 
     def __str__(self):
-        return f"Route: {self.route}, Length: {self.length}, LB: {self.lb}, Class: {self.cls}, isActive: {self.isActive}"
+        return f"Route: {self.route}, Length: {self.length}, LB: {self.lb}, Class: {self.cls}, isActive: {self.is_active}"
 
     def __lt__(self, other: "Path") -> bool:
         return (not self.is_active, self.lb) < (not other.is_active, other.lb)
 
+    def heap_entry(self) -> HeapEntry:
+        """
+        Heap girdisi (not is_active, lb, sıra no, yol). Karşılaştırma C'deki
+        tuple karşılaştırmasıyla biter (sıra no tektir), __lt__ çağrılmaz;
+        eşit anahtarlar ekleme sırasıyla çıkar. is_active / lb değişirse
+        girdi yeniden oluşturulmalıdır.
+        """
+        return (not self.is_active, self.lb, next(_entry_sequence), self)
+
+    def __contains__(self, vertex: int) -> bool:
+        """vertex yolda mı? Küme ilk sorguda kurulur, sonrası O(1)."""
+        if self._members is None:
+            self._members = {node.vertex for node in self.nodes()}
+        return vertex in self._members
+
+    def __len__(self) -> int:
+        """Yoldaki düğüm sayısı."""
+        return len(self.route)
+
     def tail(self) -> Optional[int]:
-        return self.route[-1] if self.route else None
+        return self.node.vertex if self.node is not None else None
 
     def head(self) -> Optional[int]:
-        return self.route[0] if self.route else None
+        return self.route[0] if self.node is not None else None
+
+    def append(self, vertex: int, weight: float = 0.0, edge: int = -1) -> None:
+        """
+        Yolu yerinde vertex ile uzat (önek paylaşılmaya devam eder).
+        edge: yeni kenarın id'si; yalnızca ilk düğümde -1 olabilir.
+        """
+        parent = self.node
+        self.node = PathNode(vertex, weight, parent, edge)
+        if self._route is not None:
+            self._route.append(vertex)
+        if self._edges is not None and parent is not None:
+            self._edges[(parent.vertex, vertex)] = weight
+        if self._members is not None:
+            self._members.add(vertex)
+
+    def extended(self, vertex: int, weight: float, edge: int) -> "Path":
+        """Bu yolun vertex ile uzatılmış kopyası; önek düğümleri paylaşılır."""
+        path = self.copy()
+        path.append(vertex, weight, edge)
+        return path
+
+    def relabel(self, label: Callable[[int], int]) -> "Path":
+        """Düğümleri label(v) ile yeniden adlandırılmış kopya (uzunluklar aynı kalır)."""
+        path = self.copy()
+        path.node = None
+        for node in self.nodes():
+            path.node = PathNode(label(node.vertex), node.weight, path.node, node.edge)
+        return path
 
     def copy(self) -> "Path":
-        """Deep Copy"""
-        return Path(
-            route=self.route.copy(),
-            edges=self.edges.copy(),
-            length=self.length,
-            lb=self.lb,
-            cls=self.cls,
-            is_active=self.is_active,
-            cached_intersections=self.cached_intersections.copy()
-        )
+        """
+        Önek paylaşan kopya: route / edges kopyalanmaz. Düğüm kümesi
+        kurulmuşsa bir kez kopyalanır (C'de); extended() ona yeni düğümü
+        ekler, kopyanın döngü kontrolü zinciri yeniden gezmez.
+        """
+        path = Path(self.node, self.lb, self.cls, self.is_active)
+        if self._members is not None:
+            path._members = self._members.copy()
+        if self.cached_intersections is not None:
+            path.cached_intersections = self.cached_intersections.copy()
+        if self._overlap is not None:
+            path._overlap = self._overlap.copy()
+            path._overlap_node = self._overlap_node
+        return path
 
     def LB1(self, graph_state):
         from .graph_utils import construct_partial_spt 
@@ -62,38 +246,133 @@ class Path:
         if tail is None:
             return 0
 
-        if not graph_state.isSettled[tail]:
-            construct_partial_spt(graph_state=graph_state, v=tail)
+        if graph_state.isSettled[tail]:
+            return self.length + graph_state.distances[tail]
 
+        if graph_state.heuristic is not None:
+            return self.length + graph_state.heuristic[tail]
+
+        construct_partial_spt(graph_state=graph_state, v=tail)
         return self.length + graph_state.distances[tail]
 
+    def intersections(self, result_set: "ResultSet") -> List[float]:
+        """
+        result_set'teki her yolla ortak kenar uzunlukları.
+
+        Sayaçlar yolla birlikte taşınır: son çağrıdan sonra eklenen kenarlar
+        için yalnızca fark hesaplanır, yani uzatma başına O(1) iş düşer.
+        Son çağrıdan sonra result_set'e giren yollar tek bir vektörel
+        kesişimle (ResultSet.overlaps) eklenir.
+        """
+        if self._overlap is None:
+            self._overlap = []
+        overlap = self._overlap
+        counted = len(overlap)
+        edge_results = result_set.edge_results
+
+        # Önceki sonuçlar: yalnızca yeni eklenen kenarlar
+        if counted:
+            node = self.node
+            stop = self._overlap_node
+            while node is not stop and node.parent is not None:
+                for i in edge_results.get(node.edge, ()):
+                    if i < counted:
+                        overlap[i] += node.weight
+                node = node.parent
+
+        # Yeni sonuçlar: tüm yol bir kez
+        if counted < len(result_set):
+            overlap.extend(result_set.overlaps(self, counted).tolist())
+
+        self._overlap_node = self.node
+        return overlap
+
     def LB2(self, threshold, result_set):
         if not result_set:
             return 0
 
-        lb2 = 0
-        for old_path in result_set:
-            if id(old_path) in self.cached_intersections:
-                intersection_length = self.cached_intersections[id(old_path)]
-
-            else:
-                common_edges = set(old_path.edges.keys()).intersection(set(self.edges.keys()))
-                intersection_length = sum(old_path.edges[e] for e in common_edges)
-                self.cached_intersections[id(old_path)] = intersection_length
+        # Her sonuç için ortak uzunluk ilk değerlendirildiği anda sabitlenir ve
+        # uzatılan yollara aktarılır. Yol uzadıkça büyüyen ortak uzunluk daha
+        # sıkı ama yine geçerli bir sınır verirdi; ancak KSPD'nin sınıf içi
+        # baskınlık (is_active) varsayımı bu gevşek sınırla kuruludur.
+        if self.cached_intersections is None:
+            self.cached_intersections = []
+        cached = self.cached_intersections
+        if len(cached) < len(result_set):
+            cached.extend(self.intersections(result_set)[len(cached):])
 
+        lb2 = 0
+        for old_path, intersection_length in zip(result_set, cached):
             current_lb2 = intersection_length * (1 + 1 / threshold) - old_path.length
             lb2 = max(lb2, current_lb2)
 
         return lb2
 
     def similarity(self, threshold, result_set):
-        for old_path in result_set:
-            common_edges = set(old_path.edges.keys()).intersection(set(self.edges.keys()))
-            intersection_length = sum(old_path.edges[e] for e in common_edges)
-            union_length = self.length + old_path.length - intersection_length
-
-            if union_length > 0:
-                similarity = intersection_length / union_length
-                if similarity > threshold:
-                    return False
-        return True
\ No newline at end of file
+        if not result_set:
+            return True
+
+        # Tüm sonuçlara karşı tek seferde: |ortak| / |birleşim| > threshold var mı?
+        intersection = np.array(self.intersections(result_set))
+        union = self.length + result_set.lengths() - intersection
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarity = np.where(union > 0, intersection / union, 0.0)
+        return not bool(np.any(similarity > threshold))
+
+
+class ResultSet(list):
+    """
+    Kabul edilen yollar.
+
+    Her yol eklenirken kenar id'leri edge_results'a (kenar id -> result_set
+    indeksleri) kaydedilir; Path.intersections aday yolların ortak
+    uzunluklarını bu eşlemden artımlı olarak günceller. Ayrıca sonuçların
+    sıralı kenar id'leri ve ağırlıkları -1 ile doldurulmuş bir matriste
+    üst üste tutulur; bir yolun tüm sonuçlarla kesişimi tek bir vektörel
+    işlemdir (overlaps).
+    """
+
+    def __init__(self, paths=()):
+        super().__init__()
+        self.edge_results: Dict[int, List[int]] = {}
+        self._edge_ids: List[np.ndarray] = []
+        self._weights: List[np.ndarray] = []
+        self._stacked: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        for path in paths:
+            self.append(path)
+
+    def append(self, path: Path) -> None:
+        index = len(self)
+        super().append(path)
+
+        edges = [node for node in path.nodes() if node.parent is not None]
+        for node in edges:
+            self.edge_results.setdefault(node.edge, []).append(index)
+
+        edge_ids = np.fromiter((node.edge for node in edges), dtype=np.int32, count=len(edges))
+        order = np.argsort(edge_ids)
+        self._edge_ids.append(edge_ids[order])
+        self._weights.append(np.fromiter((node.weight for node in edges), dtype=np.float64, count=len(edges))[order])
+        self._stacked = None
+
+    def _stack(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(kenar id matrisi, ağırlık matrisi, uzunluklar); append'e kadar saklanır."""
+        if self._stacked is None:
+            width = max((len(edge_ids) for edge_ids in self._edge_ids), default=0)
+            edge_ids = np.full((len(self), width), -1, dtype=np.int32)
+            weights = np.zeros((len(self), width), dtype=np.float64)
+            for i, (row_ids, row_weights) in enumerate(zip(self._edge_ids, self._weights)):
+                edge_ids[i, :len(row_ids)] = row_ids
+                weights[i, :len(row_weights)] = row_weights
+            lengths = np.array([path.length for path in self], dtype=np.float64)
+            self._stacked = (edge_ids, weights, lengths)
+        return self._stacked
+
+    def lengths(self) -> np.ndarray:
+        return self._stack()[2]
+
+    def overlaps(self, path: Path, start: int = 0) -> np.ndarray:
+        """path'in result_set[start:] yollarıyla ortak kenar uzunlukları."""
+        edge_ids, weights, _ = self._stack()
+        shared = np.isin(edge_ids[start:], path.edge_ids())
+        return np.where(shared, weights[start:], 0.0).sum(axis=1)
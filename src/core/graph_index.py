@@ -0,0 +1,201 @@
+import weakref
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import networkx as nx
+
+from .csr_graph import CSRGraph
+from .priority_queue import select_queue
+
+
+class SPTBuffers:
+    """
+    Bir GraphState'in distances / isSettled / parent dizileri.
+
+    Diziler graf başına bir kez ayrılır ve sorgular arasında yeniden
+    kullanılır. Sıfırlama yalnızca touched listesindeki (sorgu sırasında
+    yazılan) düğümleri gezer, yani O(dokunulan düğüm). Her reset'te
+    generation artar; GraphState kendi generation'ını saklayarak
+    dizilerin hâlâ kendisine ait olup olmadığını anlayabilir.
+    """
+
+    def __init__(self, n: int):
+        self.distances: List[float] = [float('inf')] * n
+        self.isSettled: List[bool] = [False] * n
+        self.parent: List[Optional[int]] = [None] * n
+        self.touched: List[int] = []
+        self.generation = 0
+
+    def reset(self) -> None:
+        distances, isSettled, parent = self.distances, self.isSettled, self.parent
+        for node in self.touched:
+            distances[node] = float('inf')
+            isSettled[node] = False
+            parent[node] = None
+        self.touched.clear()
+        self.generation += 1
+
+
+class SPTBufferPool:
+    """
+    Bir grafın SPTBuffers havuzu. Aynı anda yaşayan GraphState sayısı
+    kadar dizi seti ayrılır; serbest bırakılan set sonraki sorguda
+    sıfırlanarak (tembel, O(touched)) yeniden kullanılır.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self._free: List[SPTBuffers] = []
+
+    def acquire(self) -> SPTBuffers:
+        buffers = self._free.pop() if self._free else SPTBuffers(self.n)
+        buffers.reset()
+        return buffers
+
+    def release(self, buffers: SPTBuffers) -> None:
+        self._free.append(buffers)
+
+
+class SearchBuffers:
+    """
+    Tek seferlik (SPT gibi sürdürülmeyen) Dijkstra aramalarının paylaşılan
+    distances / parent dizileri.
+
+    Diziler graf başına bir kez ayrılır ve hiç sıfırlanmaz: her arama
+    begin() ile yeni bir generation alır, stamp[v] != generation olan
+    düğümün mesafesi inf sayılır. Böylece bir aramanın maliyeti |V|'ye
+    değil yalnızca ziyaret ettiği düğümlere bağlıdır.
+    """
+
+    def __init__(self, n: int):
+        self.distances: List[float] = [float('inf')] * n
+        self.parent: List[int] = [-1] * n
+        self.stamp: List[int] = [0] * n
+        self.generation = 0
+
+    def begin(self) -> int:
+        """Yeni bir arama başlat; önceki aramanın tüm değerleri geçersizleşir."""
+        self.generation += 1
+        return self.generation
+
+
+class GraphIndex:
+    """
+    Bir grafa ait, sorgular ve algoritma nesneleri arasında paylaşılan
+    indeks: ileri (graph) ve ters (reverse) CSR komşuluğunu tutar.
+
+    GraphIndex.of(graph) aynı graf nesnesi için her zaman aynı indeksi
+    döndürür; böylece networkx -> CSR dönüşümü ve ters graf graf başına
+    yalnızca bir kez kurulur.
+
+    networkx grafının düğüm ya da kenar sayısı değiştiyse indeks yeniden
+    kurulur. Sayıları değiştirmeyen yerinde düzenlemelerden (ağırlık
+    güncelleme, kenarı başka düğüme bağlama) sonra invalidate(graph)
+    çağrılmalıdır; of() her çağrıda adjacency'yi taramaz. CSRGraph
+    değiştirilmez kabul edilir.
+    """
+
+    # networkx grafı -> indeks. İndeks nx grafına referans tutmadığı için
+    # graf silinince indeks de bırakılır. CSRGraph'lar indekslerini
+    # kendileri tutar (CSRGraph._index).
+    _instances: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def __init__(self, graph: Union[nx.DiGraph, CSRGraph]):
+        if isinstance(graph, CSRGraph):
+            self.graph = graph
+            self._fingerprint = None
+        else:
+            self.graph = CSRGraph.from_networkx(graph)
+            self._fingerprint = self._fingerprint_of(graph)
+
+        self._reverse: Optional[CSRGraph] = None
+        self._spt_pool: Optional[SPTBufferPool] = None
+        self._search_buffers: Optional[SearchBuffers] = None
+        self._spt_cache = None
+        self._queue_factory: Optional[Callable[[], Any]] = None
+
+        # Önceden kurulmuş LandmarkIndex (ALT) / ContractionHierarchy.
+        # Atanırsa bu graf üzerindeki tüm algoritmalar varsayılan olarak
+        # onları kullanır.
+        self.landmarks = None
+        self.hierarchy = None
+
+    @classmethod
+    def of(cls, graph: Union[nx.DiGraph, CSRGraph, "GraphIndex"]) -> "GraphIndex":
+        """graph için paylaşılan indeksi döndür, yoksa kur."""
+        if isinstance(graph, GraphIndex):
+            return graph
+
+        if isinstance(graph, CSRGraph):
+            if graph._index is None:
+                graph._index = cls(graph)
+            return graph._index
+
+        index = cls._instances.get(graph)
+
+        # networkx grafı sonradan değiştirildiyse indeksi yeniden kur
+        if index is None or index._fingerprint != cls._fingerprint_of(graph):
+            index = cls(graph)
+            cls._instances[graph] = index
+
+        return index
+
+    @classmethod
+    def invalidate(cls, graph: Union[nx.DiGraph, CSRGraph]) -> None:
+        """graph'ın paylaşılan indeksini bırak; sonraki of() yeniden kurar."""
+        if isinstance(graph, CSRGraph):
+            graph._index = None
+        else:
+            cls._instances.pop(graph, None)
+
+    @staticmethod
+    def _fingerprint_of(graph: nx.DiGraph) -> Tuple[int, int]:
+        # nx number_of_edges() derece görünümleri üzerinden Python'da toplar;
+        # ham adjacency dict'lerinin uzunlukları C'de toplanır (sorgu başına ~ms)
+        return len(graph._adj), sum(map(len, graph._adj.values()))
+
+    @property
+    def reverse(self) -> CSRGraph:
+        """Ters CSR; ilk erişimde bir kez kurulur."""
+        if self._reverse is None:
+            self._reverse = self.graph.reverse()
+        return self._reverse
+
+    def number_of_nodes(self) -> int:
+        return self.graph.number_of_nodes()
+
+    @property
+    def spt_pool(self) -> SPTBufferPool:
+        """Bu graf üzerinde kurulan GraphState'lerin dizi havuzu."""
+        if self._spt_pool is None:
+            self._spt_pool = SPTBufferPool(self.number_of_nodes())
+        return self._spt_pool
+
+    @property
+    def search_buffers(self) -> SearchBuffers:
+        """Bu graf üzerindeki tek seferlik Dijkstra aramalarının (ilk yol, Yen spur'ları) dizileri."""
+        if self._search_buffers is None:
+            self._search_buffers = SearchBuffers(self.number_of_nodes())
+        return self._search_buffers
+
+    @property
+    def spt_cache(self):
+        """Hedef düğüme göre paylaşılan ters SPT önbelleği (bkz. SPTCache)."""
+        if self._spt_cache is None:
+            from .spt_cache import SPTCache
+            # import here to avoid circular import
+            self._spt_cache = SPTCache(self.reverse)
+        return self._spt_cache
+
+    @property
+    def queue_factory(self) -> Callable[[], Any]:
+        """
+        Bu graf üzerindeki Dijkstra aramalarının öncelik kuyruğu; ağırlıklara
+        göre bir kez seçilir (bkz. select_queue). Elle de atanabilir.
+        """
+        if self._queue_factory is None:
+            self._queue_factory = select_queue(self.graph)
+        return self._queue_factory
+
+    @queue_factory.setter
+    def queue_factory(self, factory: Callable[[], Any]) -> None:
+        self._queue_factory = factory
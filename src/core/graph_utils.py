@@ -1,58 +1,217 @@
 import heapq
+from array import array
 import networkx as nx
-from typing import Optional, Tuple, Dict, List
+from typing import Optional, Tuple, Dict, List, Sequence, Set, Union
+from .csr_graph import CSRGraph
 from .data_structures import Path, GraphState
+from .graph_index import GraphIndex
 
 
-def reverse(graph: nx.DiGraph) -> nx.DiGraph:
+def reverse(graph: Union[nx.DiGraph, CSRGraph]) -> Union[nx.DiGraph, CSRGraph]:
+    if isinstance(graph, CSRGraph):
+        return graph.reverse()
+
     Gr = nx.DiGraph()
     Gr.add_edges_from((v, u, d) for u, v, d in graph.edges(data=True))
     return Gr
 
 
 def dijkstra(
-        graph: nx.DiGraph,
+        graph: CSRGraph,
         src: int,
         dest: int
 ) -> Optional[Path]:
     if src == dest:
         path = Path()
-        path.route = [src]
+        path.append(src)
+        return path
+
+    # Heap'e yol listesi yerine yalnızca (cost, node) konur; yol, dest
+    # settle edildiğinde parent dizisinden bir kez kurulur. Diziler grafın
+    # paylaşılan, generation damgalı dizileridir (bkz. SearchBuffers).
+    index = GraphIndex.of(graph)
+    buffers = index.search_buffers
+    generation = buffers.begin()
+    distances, parent, stamp = buffers.distances, buffers.parent, buffers.stamp
+    stamp[src] = generation
+    distances[src] = 0
+    parent[src] = -1
+    queue = index.queue_factory()
+    push, pop = queue.push, queue.pop
+    push((0, src))
+
+    while queue:
+        cost, node = pop()
+
+        if cost > distances[node]:
+            continue
+
+        if node == dest:
+            return _build_path(graph, parent, dest)
+
+        for neighbor, weight in graph.successors(node):
+            new_cost = cost + weight
+            if stamp[neighbor] != generation or new_cost < distances[neighbor]:
+                stamp[neighbor] = generation
+                distances[neighbor] = new_cost
+                parent[neighbor] = node
+                push((new_cost, neighbor))
+
+    return None
+
+
+def bidirectional_dijkstra(
+        graph: CSRGraph,
+        graph_reverse: CSRGraph,
+        src: int,
+        dest: int,
+        excluded_nodes: Optional[Set[int]] = None,
+        excluded_edges: Optional[Set[Tuple[int, int]]] = None
+) -> Optional[Path]:
+    """
+    src'den ileri (graph) ve dest'ten geri (graph_reverse) eş zamanlı
+    Dijkstra. excluded_nodes / excluded_edges Yen'deki gibi grafı
+    kısıtlar; iki yön de aynı filtreyi uyguladığı için arama kısıtlı alt
+    graf üzerinde yapılmış olur.
+
+    mu, izin verilen bir kenar üzerinden iki ağacın buluştuğu en iyi
+    s-t uzunluğudur. İki heap'in tepe değerleri toplamı mu'ya ulaşınca
+    daha kısa bir yol kalmaz ve arama durur. Bu kural dışlanan
+    kenar/düğümlerle de güvenlidir, çünkü mu yalnızca izin verilen
+    kenarlardan güncellenir ve dışlanan düğümler hiç settle edilmez.
+    """
+    if src == dest:
+        path = Path()
+        path.append(src)
         return path
 
-    heap = [(0, src, [])]
-    visited = set()
+    if excluded_nodes is None:
+        excluded_nodes = set()
+    if excluded_edges is None:
+        excluded_edges = set()
+
+    if src in excluded_nodes or dest in excluded_nodes:
+        return None
+
+    forward = (graph, {src: 0}, {src: None}, GraphIndex.of(graph).queue_factory(), set())
+    backward = (graph_reverse, {dest: 0}, {dest: None}, GraphIndex.of(graph_reverse).queue_factory(), set())
+    forward[3].push((0, src))
+    backward[3].push((0, dest))
+
+    mu = float('inf')
+    meeting = None  # (u, v): ileri ağaçta u, geri ağaçta v olan kenar
+
+    while forward[3] and backward[3]:
+        top_forward, top_backward = forward[3].min_key(), backward[3].min_key()
+        if top_forward + top_backward >= mu:
+            break
+
+        # Tepe değeri küçük olan yönü genişlet
+        is_forward = top_forward <= top_backward
+        search_graph, distances, parent, queue, settled = forward if is_forward else backward
+        other_distances = backward[1] if is_forward else forward[1]
+
+        cost, node = queue.pop()
+        if node in settled:
+            continue
+        settled.add(node)
+
+        for neighbor, weight in search_graph.successors(node):
+            if neighbor in excluded_nodes:
+                continue
+
+            edge = (node, neighbor) if is_forward else (neighbor, node)
+            if edge in excluded_edges:
+                continue
+
+            new_cost = cost + weight
+            if new_cost < distances.get(neighbor, float('inf')):
+                distances[neighbor] = new_cost
+                parent[neighbor] = node
+                queue.push((new_cost, neighbor))
+
+            if neighbor in other_distances and new_cost + other_distances[neighbor] < mu:
+                mu = new_cost + other_distances[neighbor]
+                meeting = edge
+
+    if meeting is None:
+        return None
+
+    u, v = meeting
+    route = []
+    current = u
+    while current is not None:
+        route.append(current)
+        current = forward[2][current]
+    route.reverse()
+
+    current = v
+    while current is not None:
+        route.append(current)
+        current = backward[2][current]
+
+    return _path_from_route(graph, route)
+
+
+def astar(
+        graph: CSRGraph,
+        src: int,
+        dest: int,
+        heuristic: Sequence[float],
+        excluded_nodes: Optional[Set[int]] = None,
+        excluded_edges: Optional[Set[Tuple[int, int]]] = None
+) -> Optional[Path]:
+    """
+    A* araması. heuristic[v], v'den dest'e olan mesafenin tutarlı
+    (consistent) bir alt sınırı olmalı; örn. LandmarkIndex.heuristic_to(dest).
+    excluded_nodes / excluded_edges bidirectional_dijkstra'daki gibidir.
+    """
+    if src == dest:
+        path = Path()
+        path.append(src)
+        return path
+
+    if excluded_nodes is None:
+        excluded_nodes = set()
+    if excluded_edges is None:
+        excluded_edges = set()
+
+    distances = {src: 0}
+    parent = {src: None}
+    heap = [(heuristic[src], 0, src)]
+    settled = set()
 
     while heap:
-        cost, node, path_list = heapq.heappop(heap)
+        _, cost, node = heapq.heappop(heap)
 
-        if node in visited:
+        if node in settled:
             continue
-        visited.add(node)
+        settled.add(node)
 
         if node == dest:
-            shortest_path = Path()
-
-            for i in range(len(path_list)):
-                if i < len(path_list) - 1:
-                    u, v = path_list[i], path_list[i + 1]
-                    shortest_path.edges[(u, v)] = graph[u][v]['weight']
-                    shortest_path.length += graph[u][v]['weight']
-                    shortest_path.route.append(u)
-                else:
-                    u, v = path_list[i], dest
-                    shortest_path.edges[(u, v)] = graph[u][v]['weight']
-                    shortest_path.length += graph[u][v]['weight']
-                    shortest_path.route.append(u)
-                    shortest_path.route.append(v)
-
-            shortest_path.lb = shortest_path.length
-            return shortest_path
-
-        for neighbor, data in graph[node].items():
-            if neighbor not in visited:
-                new_cost = cost + data['weight']
-                heapq.heappush(heap, (new_cost, neighbor, path_list + [node]))
+            route = []
+            current = dest
+            while current is not None:
+                route.append(current)
+                current = parent[current]
+            route.reverse()
+            return _path_from_route(graph, route)
+
+        for neighbor, weight in graph.successors(node):
+            if neighbor in excluded_nodes or neighbor in settled:
+                continue
+            if (node, neighbor) in excluded_edges:
+                continue
+
+            estimate = heuristic[neighbor]
+            if estimate == float('inf'):
+                continue  # neighbor'dan dest'e yol yok
+
+            new_cost = cost + weight
+            if new_cost < distances.get(neighbor, float('inf')):
+                distances[neighbor] = new_cost
+                parent[neighbor] = node
+                heapq.heappush(heap, (new_cost + estimate, new_cost, neighbor))
 
     return None
 
@@ -61,8 +220,11 @@ def construct_partial_spt(graph_state: GraphState, v: int) -> float:
     if graph_state.isSettled[v]:
         return graph_state.distances[v]
 
-    while graph_state.PQ:
-        cost, node = heapq.heappop(graph_state.PQ)
+    queue = graph_state.PQ
+    push, pop = queue.push, queue.pop
+
+    while queue:
+        cost, node = pop()
 
         if cost > graph_state.distances[node]:
             continue
@@ -70,14 +232,18 @@ def construct_partial_spt(graph_state: GraphState, v: int) -> float:
         if not graph_state.isSettled[node]:
             graph_state.isSettled[node] = True
 
-            for neighbor, data in graph_state.graph_reverse[node].items():
+            for neighbor, weight in graph_state.graph_reverse.successors(node):
                 if not graph_state.isSettled[neighbor]:
-                    new_cost = cost + data['weight']
+                    new_cost = cost + weight
+                    old_cost = graph_state.distances[neighbor]
 
-                    if new_cost < graph_state.distances[neighbor]:
+                    if new_cost < old_cost:
+                        if old_cost == float('inf'):
+                            # İlk kez dokunulan düğüm; sıfırlama yalnızca bunları gezer
+                            graph_state.touched.append(neighbor)
                         graph_state.distances[neighbor] = new_cost
                         graph_state.parent[neighbor] = node
-                        heapq.heappush(graph_state.PQ, (new_cost, neighbor))
+                        push((new_cost, neighbor))
 
             if node == v:
                 return graph_state.distances[v]
@@ -85,24 +251,86 @@ def construct_partial_spt(graph_state: GraphState, v: int) -> float:
     return float('inf')
 
 
+class SPTDistances:
+    """
+    graph_state'in ters SPT'sinden kesin d(v, dest). v henüz settle
+    edilmediyse ağaç v'ye kadar büyütülür. Kısıtsız grafta kesin mesafe,
+    kenar / düğüm dışlanan alt graf için tutarlı bir alt sınırdır; astar'a
+    heuristic olarak verilebilir.
+    """
+
+    __slots__ = ("graph_state",)
+
+    def __init__(self, graph_state: GraphState):
+        self.graph_state = graph_state
+
+    def __getitem__(self, v: int) -> float:
+        if self.graph_state.isSettled[v]:
+            return self.graph_state.distances[v]
+        return construct_partial_spt(graph_state=self.graph_state, v=v)
+
+
+def spt_route(
+        graph_state: GraphState,
+        src: int,
+        excluded_nodes: Set[int],
+        excluded_edges: Set[Tuple[int, int]]
+) -> Optional[List[int]]:
+    """
+    src settle edilmişse ters SPT'nin src'den dest'e parent zinciri; zincir
+    dışlanan bir düğüme ya da kenara değiyorsa None. None değilse bu route
+    kısıtlı alt grafta da en kısa yoldur (kısıtsız en kısa yol zaten izinli).
+    """
+    route = [src]
+    current = src
+    parent = graph_state.parent
+    while current != graph_state.destination:
+        following = parent[current]
+        if following is None or following in excluded_nodes or (current, following) in excluded_edges:
+            return None
+        route.append(following)
+        current = following
+    return route
+
+
+def shortest_path_from_spt(
+        graph: CSRGraph,
+        graph_state: GraphState,
+        src: int
+) -> Optional[Path]:
+    """
+    dest köklü ters SPT'yi src settle edilene kadar büyüt ve en kısa yolu
+    parent zincirinden oku; ayrı bir ileri Dijkstra gerekmez.
+    """
+    if construct_partial_spt(graph_state=graph_state, v=src) == float('inf'):
+        return None
+
+    route = [src]
+    current = src
+    while current != graph_state.destination:
+        current = graph_state.parent[current]
+        route.append(current)
+
+    return _path_from_route(graph, route)
+
+
 def _build_path(
-        graph: nx.DiGraph,
-        path_list: List[int],
-        dest: int,
-        cost: float
+        graph: CSRGraph,
+        parent: array,
+        dest: int
 ) -> Path:
-    shortest_path = Path()
+    """parent dizisini (kök için -1) dest'ten geriye izleyerek yolu kur."""
+    route = []
+    current = dest
+    while current != -1:
+        route.append(current)
+        current = parent[current]
+    route.reverse()
 
-    for i in range(len(path_list)):
-        if i < len(path_list) - 1:
-            u, v = path_list[i], path_list[i + 1]
-        else:
-            u, v = path_list[i], dest
+    return _path_from_route(graph, route)
 
-        shortest_path.edges[(u, v)] = graph[u][v]['weight']
-        shortest_path.length += graph[u][v]['weight']
-        shortest_path.route.append(u)
 
-    shortest_path.route.append(dest)
+def _path_from_route(graph: CSRGraph, route: List[int]) -> Path:
+    shortest_path = Path.from_route(route, graph)
     shortest_path.lb = shortest_path.length
     return shortest_path
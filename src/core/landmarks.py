@@ -0,0 +1,220 @@
+import random
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .csr_graph import CSRGraph
+from .graph_index import GraphIndex
+
+LANDMARK_STRATEGIES = ("farthest", "avoid")
+
+
+def _shortest_path_tree(graph: CSRGraph, src: int) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    """src'den tam Dijkstra: (mesafeler, parent (-1 = yok), settle sırası)."""
+    n = graph.number_of_nodes()
+    distances = array('d', [float('inf')]) * n
+    parent = array('i', [-1]) * n
+    distances[src] = 0
+    queue = GraphIndex.of(graph).queue_factory()
+    push, pop = queue.push, queue.pop
+    push((0, src))
+    order = []
+
+    while queue:
+        cost, node = pop()
+
+        if cost > distances[node]:
+            continue
+        order.append(node)
+
+        for neighbor, weight in graph.successors(node):
+            new_cost = cost + weight
+            if new_cost < distances[neighbor]:
+                distances[neighbor] = new_cost
+                parent[neighbor] = node
+                push((new_cost, neighbor))
+
+    return np.frombuffer(distances, dtype=np.float64), np.frombuffer(parent, dtype=np.int32), order
+
+
+class LandmarkIndex:
+    """
+    ALT (A*, landmarks, triangle inequality) ön işlemesi.
+
+    Her landmark L için from_landmarks[i][v] = d(L, v) ve
+    to_landmarks[i][v] = d(v, L) saklanır. Üçgen eşitsizliğinden
+
+        d(v, t) >= max(d(v, L) - d(t, L), d(L, t) - d(L, v))
+
+    olduğu için heuristic_to(t) tutarlı (consistent) bir alt sınır verir.
+    İndeks bir kez kurulup save() ile sıkıştırılmış .npz dosyasına yazılır.
+    """
+
+    def __init__(self, landmarks: np.ndarray, from_landmarks: np.ndarray, to_landmarks: np.ndarray):
+        self.landmarks = landmarks
+        self.from_landmarks = from_landmarks
+        self.to_landmarks = to_landmarks
+        self._heuristics: "OrderedDict[int, array]" = OrderedDict()
+        self.max_cached_heuristics = 16
+
+    @classmethod
+    def build(
+            cls,
+            graph: CSRGraph,
+            count: int = 16,
+            strategy: str = "farthest",
+            seed: int = 0
+    ) -> "LandmarkIndex":
+        """
+        count landmark seç ve mesafe dizilerini hesapla.
+
+        strategy:
+            "farthest": her adımda seçilmiş landmark'lara en uzak düğüm
+            "avoid":    Goldberg & Werneck'in avoid sezgiseli; mevcut
+                        landmark'ların iyi kapsamadığı SPT alt ağaçlarının
+                        yaprağını seç
+        """
+        if strategy not in LANDMARK_STRATEGIES:
+            raise ValueError(f"strategy {LANDMARK_STRATEGIES} değerlerinden biri olmalı")
+
+        n = graph.number_of_nodes()
+        count = min(count, n)
+        rnd = random.Random(seed)
+        graph_reverse = graph.reverse()
+
+        landmarks: List[int] = []
+        from_rows: List[np.ndarray] = []
+        to_rows: List[np.ndarray] = []
+
+        def add(landmark):
+            landmarks.append(landmark)
+            from_rows.append(_shortest_path_tree(graph, landmark)[0])
+            to_rows.append(_shortest_path_tree(graph_reverse, landmark)[0])
+
+        while len(landmarks) < count:
+            if strategy == "farthest":
+                landmark = cls._select_farthest(graph, from_rows, landmarks, rnd)
+            else:
+                landmark = cls._select_avoid(graph, from_rows, to_rows, landmarks, rnd)
+
+            if landmark is None:
+                break
+            add(landmark)
+
+        return cls(
+            np.array(landmarks, dtype=np.int32),
+            np.vstack(from_rows) if from_rows else np.empty((0, n)),
+            np.vstack(to_rows) if to_rows else np.empty((0, n)),
+        )
+
+    @staticmethod
+    def _select_farthest(graph, from_rows, landmarks, rnd) -> Optional[int]:
+        n = graph.number_of_nodes()
+        if not landmarks:
+            distances = _shortest_path_tree(graph, rnd.randrange(n))[0]
+        else:
+            distances = np.min(np.vstack(from_rows), axis=0)
+
+        candidates = np.where(np.isfinite(distances), distances, -1.0)
+        candidates[landmarks] = -1.0
+        best = int(np.argmax(candidates))
+        return best if candidates[best] > 0 else None
+
+    @staticmethod
+    def _select_avoid(graph, from_rows, to_rows, landmarks, rnd) -> Optional[int]:
+        n = graph.number_of_nodes()
+        root = rnd.randrange(n)
+        distances, parent, order = _shortest_path_tree(graph, root)
+
+        # weight(v) = d(r, v) - LB(r, v): mevcut landmark'ların sınırı ne kadar gevşek
+        if landmarks:
+            from_matrix, to_matrix = np.vstack(from_rows), np.vstack(to_rows)
+            with np.errstate(invalid='ignore'):
+                bounds = np.fmax(
+                    np.fmax.reduce(to_matrix[:, [root]] - to_matrix, axis=0),
+                    np.fmax.reduce(from_matrix - from_matrix[:, [root]], axis=0)
+                )
+            weight = distances - np.nan_to_num(np.fmax(bounds, 0), posinf=0)
+        else:
+            weight = distances.copy()
+
+        # size(v) = alt ağaçtaki ağırlık toplamı; içinde landmark olan alt ağaçlar 0
+        size = np.where(np.isfinite(weight), weight, 0.0)
+        has_landmark = np.zeros(n, dtype=bool)
+        has_landmark[landmarks] = True
+
+        for node in reversed(order):
+            p = parent[node]
+            if has_landmark[node]:
+                size[node] = 0
+            if p != -1:
+                if has_landmark[node]:
+                    has_landmark[p] = True
+                else:
+                    size[p] += size[node]
+
+        # Kökten başlayıp her adımda en büyük alt ağaca in; yaprak yeni landmark
+        children: List[List[int]] = [[] for _ in range(n)]
+        for node in order:
+            if parent[node] != -1:
+                children[parent[node]].append(node)
+
+        node = root
+        while children[node]:
+            best = max(children[node], key=lambda c: size[c])
+            if size[best] <= 0:
+                break
+            node = best
+
+        if node in landmarks or (node == root and landmarks):
+            return LandmarkIndex._select_farthest(graph, from_rows, landmarks, rnd)
+        return node
+
+    def save(self, filename: str) -> None:
+        np.savez_compressed(
+            filename,
+            landmarks=self.landmarks,
+            from_landmarks=self.from_landmarks,
+            to_landmarks=self.to_landmarks,
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "LandmarkIndex":
+        with np.load(filename) as data:
+            return cls(data["landmarks"], data["from_landmarks"], data["to_landmarks"])
+
+    def number_of_nodes(self) -> int:
+        return self.from_landmarks.shape[1]
+
+    def heuristic_to(self, target: int) -> array:
+        """
+        h[v] <= d(v, target) alt sınır dizisi. Hedef başına bir kez,
+        tüm düğümler için vektörel hesaplanır ve küçük bir LRU'da tutulur.
+        """
+        cached = self._heuristics.get(target)
+        if cached is not None:
+            self._heuristics.move_to_end(target)
+            return cached
+
+        with np.errstate(invalid='ignore'):
+            # inf - inf = nan terimleri fmax ile yok sayılır
+            bounds = np.fmax(
+                np.fmax.reduce(self.to_landmarks - self.to_landmarks[:, [target]], axis=0, initial=0.0),
+                np.fmax.reduce(self.from_landmarks[:, [target]] - self.from_landmarks, axis=0, initial=0.0)
+            )
+        bounds = np.fmax(bounds, 0.0)
+        bounds[target] = 0.0
+
+        heuristic = array('d')
+        heuristic.frombytes(bounds.astype(np.float64).tobytes())
+
+        self._heuristics[target] = heuristic
+        if len(self._heuristics) > self.max_cached_heuristics:
+            self._heuristics.popitem(last=False)
+        return heuristic
+
+    def lower_bound(self, v: int, target: int) -> float:
+        """Tek bir (v, target) çifti için ALT alt sınırı."""
+        return self.heuristic_to(target)[v]
@@ -0,0 +1,138 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from .data_structures import HeapEntry, Path
+from .prefix_map import PrefixMap
+
+
+class LocalQueue:
+    """
+    FindKSPD'nin bir düğümdeki yerel kuyruğu (LQ).
+
+    Aktif yollar bir heap'te, pasif yollar ayrı tutulur; iki grup da
+    sınıfa (cls) göre indekslidir. Bir sınıfı pasifleştirmek /
+    aktifleştirmek yalnızca o sınıfın yollarını gruplar arasında taşır,
+    en iyi aktif yol pasif yolların sayısından bağımsız O(log n)'dir.
+
+    Pasifleşen yolun heap girdisi yerinde kalır ve pop'ta atlanır (güncel
+    girdi _entries'tedir). Sınıflar PrefixMap'te tembel etiketlendiği için
+    gruplar yeni bir tag_route'tan sonra ilk sınıf sorgusunda (deactivate /
+    activate) _entries'ten yeniden kurulur; push / pop gruplamayı beklemez.
+    """
+
+    __slots__ = ("_heap", "_entries", "_active", "_inactive", "_inactive_count", "_prefix_map", "_stamp")
+
+    def __init__(self, prefix_map: PrefixMap):
+        self._heap: List[HeapEntry] = []
+        # Kuyruktaki her yolun güncel girdisi (aktif ya da pasif)
+        self._entries: Dict[Path, HeapEntry] = {}
+        # sınıf -> o sınıftaki yollar (sıralı küme olarak dict)
+        self._active: Dict[Optional[Tuple], Dict[Path, None]] = {}
+        self._inactive: Dict[Optional[Tuple], Dict[Path, None]] = {}
+        self._inactive_count = 0
+        self._prefix_map = prefix_map
+        self._stamp = prefix_map.stamp
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._entries.clear()
+        self._active.clear()
+        self._inactive.clear()
+        self._inactive_count = 0
+        self._stamp = self._prefix_map.stamp
+
+    def _sync(self) -> None:
+        """Son gruplamadan sonra tag_route çağrıldıysa yolları yeniden grupla."""
+        if self._stamp == self._prefix_map.stamp:
+            return
+        self._stamp = self._prefix_map.stamp
+        resolve_cls = self._prefix_map.resolve_cls
+        active, inactive = self._active, self._inactive
+        active.clear()
+        inactive.clear()
+        for p, entry in self._entries.items():
+            (inactive if entry[0] else active).setdefault(resolve_cls(p), {})[p] = None
+
+    def push(self, entry: HeapEntry) -> None:
+        # Gruplar eskiyse yol güncel sınıfıyla eklenir; _sync hepsini yeniden kurar
+        path = entry[3]
+        self._entries[path] = entry
+        cls = self._prefix_map.resolve_cls(path)
+        if path.is_active:
+            heapq.heappush(self._heap, entry)
+            self._active.setdefault(cls, {})[path] = None
+        else:
+            self._inactive.setdefault(cls, {})[path] = None
+            self._inactive_count += 1
+
+    def _clean(self) -> None:
+        """Heap'in başındaki eskimiş (pasifleşmiş ya da çıkmış) girdileri at."""
+        heap, entries = self._heap, self._entries
+        while heap and entries.get(heap[0][3]) is not heap[0]:
+            heapq.heappop(heap)
+
+    def head(self) -> Optional[float]:
+        """En iyi aktif yolun lb'si; aktif yol yoksa None."""
+        self._clean()
+        return self._heap[0][1] if self._heap else None
+
+    def pop(self) -> Path:
+        """En iyi aktif yolu çıkar."""
+        self._clean()
+        path = heapq.heappop(self._heap)[3]
+        del self._entries[path]
+        if self._stamp == self._prefix_map.stamp:
+            cls = self._prefix_map.resolve_cls(path)
+            group = self._active[cls]
+            del group[path]
+            if not group:
+                del self._active[cls]
+        return path
+
+    def deactivate(self, cls: Optional[Tuple], length: float) -> bool:
+        """cls sınıfında uzunluğu en az length olan aktif yolları pasifleştir."""
+        if self._inactive_count == len(self._entries):
+            return False
+        self._sync()
+        group = self._active.get(cls)
+        if not group:
+            return False
+
+        moved = [p for p in group if p.length >= length]
+        if not moved:
+            return False
+
+        inactive = self._inactive.setdefault(cls, {})
+        for p in moved:
+            del group[p]
+            p.is_active = False
+            _, lb, seq, _ = self._entries[p]
+            self._entries[p] = (True, lb, seq, p)
+            inactive[p] = None
+        self._inactive_count += len(moved)
+        if not group:
+            del self._active[cls]
+        return True
+
+    def activate(self, cls: Optional[Tuple]) -> bool:
+        """cls sınıfındaki pasif yolları aktifleştir (sıra no korunur)."""
+        if not self._inactive_count:
+            return False
+        self._sync()
+        group = self._inactive.pop(cls, None)
+        if not group:
+            return False
+
+        self._inactive_count -= len(group)
+        active = self._active.setdefault(cls, {})
+        for p in group:
+            p.is_active = True
+            _, lb, seq, _ = self._entries[p]
+            entry = (False, lb, seq, p)
+            self._entries[p] = entry
+            heapq.heappush(self._heap, entry)
+            active[p] = None
+        return True
@@ -1,25 +1,173 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class PrefixNode:
+    """
+    PrefixMap trie'sinde bir önek: kökten bu düğüme kadar olan route.
+    paths, eklendiği anda route'u tam olarak bu önek olan yollardır
+    (sıralı küme olarak dict); children ve paths ilk kullanımda ayrılır.
+    tag_stamp / tag_cls: alt ağaca en son atanan tembel sınıf etiketi
+    (bkz. PrefixMap.tag_route); etiket yoksa tag_stamp 0'dır. best, bu
+    düğüm ve atalarındaki geçerli etiketin düğümüdür; best_stamp
+    damgasında hesaplanmıştır.
+    """
+
+    __slots__ = ("vertex", "parent", "children", "paths", "tag_stamp", "tag_cls", "best", "best_stamp")
+
+    def __init__(self, vertex: Optional[int] = None, parent: Optional["PrefixNode"] = None):
+        self.vertex = vertex
+        self.parent = parent
+        self.children: Optional[Dict[int, "PrefixNode"]] = None
+        self.paths: Optional[Dict] = None
+        self.tag_stamp = 0
+        self.tag_cls: Optional[Tuple] = None
+        self.best: Optional["PrefixNode"] = None
+        self.best_stamp = -1
+
+    def child(self, vertex: int) -> Optional["PrefixNode"]:
+        return self.children.get(vertex) if self.children else None
+
+    def subtree_paths(self) -> Iterator:
+        """Bu önekle başlayan tüm yollar (alt ağaçtaki düğümlerin paths'i)."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.paths:
+                yield from node.paths
+            if node.children:
+                stack.extend(node.children.values())
+
 
 class PrefixMap:
+    """
+    Route önekinden o önekle başlayan yollara eşlem; vertex geçişleriyle
+    dallanan bir trie. Her yol yalnızca kendi route'unun düğümünde tutulur:
+    insert / remove O(L), bir önekle başlayan yollar o önek düğümünün alt
+    ağacıdır (node handle: find / root'tan children ile inilir).
+
+    Sınıf etiketleri tembeldir: tag_route bir alt ağacın tüm yollarına
+    yeni cls atamasını route düğümü başına O(1) etiketle yapar; bir yolun
+    geçerli sınıfı okunurken (resolve_cls) eklendiği düğümden köke kadar
+    etiketlerden çözülür. path.prefix_node eklendiği düğüm, path.cls_stamp
+    path.cls'in hangi etiketlemeye kadar güncel olduğudur.
+    """
+
     def __init__(self):
-        self.map = {}
+        self.root = PrefixNode()
+        # Son tag_route çağrısının damgası
+        self.stamp = 0
+        self.root.best_stamp = 0
+
+    def clear(self) -> None:
+        """Tüm yolları bırak; damga sürer, eski yolların etiketleri karışmaz."""
+        self.root = PrefixNode()
+        self.root.best_stamp = self.stamp
+
+    def insert(self, path) -> PrefixNode:
+        # path.route yerine düğüm zinciri: aday yolun route'u saklanmaz
+        node = self.root
+        for path_node in path.nodes():
+            vertex = path_node.vertex
+            child = node.child(vertex)
+            if child is None:
+                if node.children is None:
+                    node.children = {}
+                child = node.children[vertex] = PrefixNode(vertex, node)
+            node = child
+
+        if node.paths is None:
+            node.paths = {}
+        node.paths[path] = None
+        path.prefix_node = node
+        path.cls_stamp = self.stamp
+        return node
+
+    def remove(self, path) -> None:
+        # Yol eklendikten sonra yerinde uzatılmış olabilir: eklendiği
+        # düğüm güncel route'un bir önekidir, yol onu handle olarak tutar
+        node = path.prefix_node
+        if node is None:
+            return
+        path.prefix_node = None
+        del node.paths[path]
+
+        # Boşalan yaprakları buda
+        while node is not self.root and not node.paths and not node.children:
+            parent = node.parent
+            del parent.children[node.vertex]
+            node = parent
+
+    def tag_route(self, route: List[int], path_id: int) -> None:
+        """
+        route[:i+1] önekiyle başlayan ve ondan uzun her yola
+        cls = (path_id, route[i]) ata; en uzun ortak önek kazanır (i >= 1).
+        Route boyunca inilen her düğüme tek bir etiket yazılır; yollar
+        resolve_cls'te çözülür.
+        """
+        self.stamp += 1
+        self.root.best_stamp = self.stamp
+        node = self.root
+        for i, vertex in enumerate(route):
+            node = node.child(vertex)
+            if node is None:
+                break
+            if i >= 1:
+                node.tag_stamp = self.stamp
+                node.tag_cls = (path_id, vertex)
+
+    def resolve_cls(self, path) -> Optional[Tuple]:
+        """
+        path'in geçerli sınıfı. path.cls_stamp'tan sonraki etiketlerden en
+        yenisi geçerlidir; aynı etiketlemede en derin düğüm kazanır. Sonuç
+        path.cls'e yazılır, yeni bir tag_route'a kadar tekrar çözülmez.
+        """
+        own = path.prefix_node
+        if own is None or path.cls_stamp == self.stamp:
+            return path.cls
+
+        best = own.best if own.best_stamp == self.stamp else self._best_tag(own)
+        if best is not None and best.tag_stamp > path.cls_stamp:
+            if best is not own or path.tail() != own.vertex:
+                path.cls = best.tag_cls
+            elif own.parent.tag_stamp == best.tag_stamp:
+                # Yolun öneki tam route[:j+1] (kuyruğu route[j]): route[j-1]
+                # etiketi geçerli; j == 1 ise sınıfı değişmez
+                path.cls = own.parent.tag_cls
 
-    def insert(self, path):
-        for i in range(len(path.route)):
-            prefix = tuple(path.route[:i+1])
+        path.cls_stamp = self.stamp
+        return path.cls
 
-            if prefix not in self.map:
-                self.map[prefix] = []
+    def _best_tag(self, node: PrefixNode) -> Optional[PrefixNode]:
+        """
+        node ve atalarındaki etiketlerden en yenisinin (eşitse en derininin)
+        düğümü. Düğüm başına damga başına bir kez hesaplanır: aynı önekteki
+        yollar kökten yürümez.
+        """
+        stamp = self.stamp
+        chain = []
+        # Kökün best'i hep None ve günceldir (bkz. tag_route)
+        while node.best_stamp != stamp:
+            chain.append(node)
+            node = node.parent
 
-            self.map[prefix].append(path)
+        best = node.best
+        for node in reversed(chain):
+            tag_stamp = node.tag_stamp
+            if tag_stamp and (best is None or tag_stamp >= best.tag_stamp):
+                best = node
+            node.best = best
+            node.best_stamp = stamp
+        return best
 
-    def remove(self, path):
-        for i in range(len(path.route)):
-            prefix = tuple(path.route[:i+1])
-            if prefix in self.map:
-                try:
-                    self.map[prefix].remove(path)
-                except ValueError:
-                    pass
+    def find(self, route) -> Optional[PrefixNode]:
+        """route önekinin düğümü; yoksa None."""
+        node = self.root
+        for vertex in route:
+            node = node.child(vertex)
+            if node is None:
+                return None
+        return node
 
-    def findPathListWithPrefix(self, route):
-        return self.map.get(tuple(route), [])
\ No newline at end of file
+    def findPathListWithPrefix(self, route) -> List:
+        node = self.find(route)
+        return list(node.subtree_paths()) if node is not None else []
@@ -0,0 +1,247 @@
+import heapq
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from .csr_graph import CSRGraph
+
+# Bu değere kadar tamsayı ağırlıklarda Dial kova kuyruğu kullanılır
+MAX_BUCKET_WEIGHT = 1024
+
+
+class BinaryHeap(list):
+    """
+    heapq tabanlı ikili heap; her ağırlık türünde çalışır.
+
+    Listenin kendisidir; push / pop doğrudan heapq.heappush / heappop'a
+    bağlıdır, yani eşit anahtarlarda sıralama eski
+    heapq.heappush(heap, (cost, node)) kullanımıyla aynıdır.
+    """
+
+    __slots__ = ("push", "pop")
+
+    def __init__(self):
+        super().__init__()
+        self.push = partial(heapq.heappush, self)
+        self.pop = partial(heapq.heappop, self)
+
+    def min_key(self):
+        return self[0][0]
+
+
+class BucketQueue:
+    """
+    Dial'ın kova kuyruğu: ağırlıklar 0..max_weight arası tamsayıyken
+    Dijkstra'nın anahtarları [current, current + max_weight] aralığında
+    kalır, bu yüzden max_weight + 1 kovalı dairesel bir dizi yeter.
+    max_weight = 1 (birim ağırlık) iki kovalı BFS'tir.
+
+    Anahtarlar monoton olmalı: pop edilen en küçük anahtardan küçük bir
+    anahtar eklenemez.
+    """
+
+    __slots__ = ("_buckets", "_width", "_current", "_size")
+
+    def __init__(self, max_weight: int = 1):
+        self._width = int(max_weight) + 1
+        self._buckets: List[List[Tuple[Any, Any]]] = [[] for _ in range(self._width)]
+        self._current = 0
+        self._size = 0
+
+    def push(self, entry: Tuple[Any, Any]) -> None:
+        self._buckets[int(entry[0]) % self._width].append(entry)
+        self._size += 1
+
+    def _advance(self) -> List[Tuple[Any, Any]]:
+        buckets, width, current = self._buckets, self._width, self._current
+        while not buckets[current % width]:
+            current += 1
+        self._current = current
+        return buckets[current % width]
+
+    def pop(self) -> Tuple[Any, Any]:
+        self._size -= 1
+        return self._advance().pop()
+
+    def min_key(self):
+        return self._advance()[-1][0]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class RadixHeap:
+    """
+    Monoton tamsayı anahtarlar için radix heap. Anahtar, son pop edilen
+    anahtarla XOR'unun bit uzunluğuna göre kovaya konur; kova 0 boşalınca
+    ilk dolu kova en küçük anahtara göre yeniden dağıtılır. Her girdi en
+    fazla ~64 kez taşınır, karşılaştırma yapılmaz.
+
+    CPython'da girdi taşımaları Python seviyesinde olduğundan C'deki heapq
+    büyük tamsayı ağırlıklarda yine de daha hızlıdır; bu yüzden
+    select_queue onu otomatik seçmez, index.queue_factory = RadixHeap ile
+    elle seçilebilir (bkz. examples/benchmarks.py).
+    """
+
+    __slots__ = ("_buckets", "_last", "_size")
+
+    def __init__(self):
+        self._buckets: List[List[Tuple[Any, Any]]] = [[] for _ in range(65)]
+        self._last = 0
+        self._size = 0
+
+    def push(self, entry: Tuple[Any, Any]) -> None:
+        self._buckets[(int(entry[0]) ^ self._last).bit_length()].append(entry)
+        self._size += 1
+
+    def _refill(self) -> List[Tuple[Any, Any]]:
+        buckets = self._buckets
+        if not buckets[0]:
+            i = 1
+            while not buckets[i]:
+                i += 1
+            entries = buckets[i]
+            buckets[i] = []
+            last = int(min(entries, key=lambda entry: entry[0])[0])
+            self._last = last
+            for entry in entries:
+                buckets[(int(entry[0]) ^ last).bit_length()].append(entry)
+        return buckets[0]
+
+    def pop(self) -> Tuple[Any, Any]:
+        self._size -= 1
+        return self._refill().pop()
+
+    def min_key(self):
+        return self._refill()[-1][0]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class IndexedHeap:
+    """
+    Adreslenebilir ikili heap: her öğe (hashable) en fazla bir kez bulunur
+    ve konumu bir dict'te tutulur. set() öğenin anahtarını ekler ya da
+    azaltır / artırır (decrease-key / increase-key), discard() öğeyi
+    çıkarır; ikisi de O(log n). Eşit anahtarlarda öğenin kendisi karşılaştırılır.
+    """
+
+    __slots__ = ("_heap", "_position")
+
+    def __init__(self):
+        self._heap: List[Tuple[Any, Hashable]] = []
+        self._position: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._position
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._position.clear()
+
+    def key(self, item: Hashable) -> Any:
+        return self._heap[self._position[item]][0]
+
+    def set(self, item: Hashable, key: Any) -> None:
+        """item'ı key ile ekle; zaten varsa anahtarını key yap."""
+        i = self._position.get(item)
+        if i is None:
+            self._heap.append((key, item))
+            self._position[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+
+        old = self._heap[i]
+        entry = (key, item)
+        if entry == old:
+            return
+        self._heap[i] = entry
+        if entry < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def discard(self, item: Hashable) -> None:
+        i = self._position.pop(item, None)
+        if i is None:
+            return
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._position[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self._position[last[1]])
+
+    def peek(self) -> Tuple[Any, Hashable]:
+        return self._heap[0]
+
+    def pop(self) -> Tuple[Any, Hashable]:
+        """En küçük (key, item) çiftini çıkar."""
+        entry = self._heap[0]
+        self.discard(entry[1])
+        return entry
+
+    def _sift_up(self, i: int) -> None:
+        heap, position = self._heap, self._position
+        entry = heap[i]
+        while i:
+            parent = (i - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[i] = heap[parent]
+            position[heap[i][1]] = i
+            i = parent
+        heap[i] = entry
+        position[entry[1]] = i
+
+    def _sift_down(self, i: int) -> None:
+        heap, position = self._heap, self._position
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[i] = heap[child]
+            position[heap[i][1]] = i
+            i = child
+        heap[i] = entry
+        position[entry[1]] = i
+
+
+def select_queue(graph: CSRGraph) -> Callable[[], Any]:
+    """
+    graph'ın kenar ağırlıklarına göre kuyruk fabrikası seç:
+
+        tümü 1                                   -> BucketQueue(1)  (BFS)
+        0..MAX_BUCKET_WEIGHT arası tamsayılar    -> BucketQueue(max ağırlık)
+        diğer (float, büyük tamsayı, negatif)    -> BinaryHeap
+
+    Kuyruklar (key, item) tuple'larıyla heapq gibi kullanılır:
+    queue.push((cost, node)), cost, node = queue.pop().
+    """
+    weights = np.frombuffer(graph.weights, dtype=np.float64)
+
+    if not has_integer_weights(graph) or weights.max() > MAX_BUCKET_WEIGHT:
+        return BinaryHeap
+    return partial(BucketQueue, max(int(weights.max()), 1))
+
+
+def has_integer_weights(graph: CSRGraph) -> bool:
+    """Tüm ağırlıklar negatif olmayan tamsayı mı (BucketQueue / RadixHeap önkoşulu)?"""
+    weights = np.frombuffer(graph.weights, dtype=np.float64)
+    return (
+        len(weights) > 0
+        and bool(np.all(weights >= 0))
+        and bool(np.all(weights == np.floor(weights)))
+        and float(weights.max()) < 2 ** 53
+    )
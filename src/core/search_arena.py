@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from .local_queue import LocalQueue
+from .prefix_map import PrefixMap
+from .priority_queue import IndexedHeap
+
+
+class SearchArena:
+    """
+    FindKSPD'nin bir sorguya ait arama durumu: önek trie'si, düğüm başına
+    yerel kuyruklar (lq), global kuyruk ve sınıf başına kapsanan düğümler.
+
+    reset() yalnızca sorgunun dokunduğu kapları boşaltır, yani
+    O(dokunulan); boşalan LocalQueue'lar ve kümeler sonraki sorgularda
+    yeniden kullanılır. Böylece tek bir algoritma nesnesi bellek büyümeden
+    art arda sorgu yanıtlayabilir.
+    """
+
+    def __init__(self):
+        self.prefix_map = PrefixMap()
+        self.global_pq = IndexedHeap() # başı aktif yerel kuyruklar, düğüme göre
+        self.lq: Dict[int, LocalQueue] = {}
+        self.covered_vertices: Dict[Optional[Tuple], Set[int]] = {}
+        self._free_queues: List[LocalQueue] = []
+        self._free_sets: List[Set[int]] = []
+
+    def local_queue(self, vertex: int) -> LocalQueue:
+        """vertex'in yerel kuyruğu; yoksa havuzdan alınır."""
+        queue = self.lq.get(vertex)
+        if queue is None:
+            queue = self._free_queues.pop() if self._free_queues else LocalQueue(self.prefix_map)
+            self.lq[vertex] = queue
+        return queue
+
+    def covered(self, cls: Optional[Tuple]) -> Set[int]:
+        """cls sınıfının kapsadığı düğümler; yoksa havuzdan alınır."""
+        vertices = self.covered_vertices.get(cls)
+        if vertices is None:
+            vertices = self._free_sets.pop() if self._free_sets else set()
+            self.covered_vertices[cls] = vertices
+        return vertices
+
+    def reset(self) -> None:
+        for queue in self.lq.values():
+            queue.clear()
+            self._free_queues.append(queue)
+        self.lq.clear()
+
+        for vertices in self.covered_vertices.values():
+            vertices.clear()
+            self._free_sets.append(vertices)
+        self.covered_vertices.clear()
+
+        self.global_pq.clear()
+        self.prefix_map.clear()
+
+
+class SearchArenaPool:
+    """
+    SearchArena havuzu (bkz. SPTBufferPool): aynı anda çalışan sorgu
+    sayısı kadar arena ayrılır, serbest bırakılan arena sıfırlanıp
+    yeniden kullanılır.
+    """
+
+    def __init__(self):
+        self._free: List[SearchArena] = []
+
+    def acquire(self) -> SearchArena:
+        return self._free.pop() if self._free else SearchArena()
+
+    def release(self, arena: SearchArena) -> None:
+        arena.reset()
+        self._free.append(arena)
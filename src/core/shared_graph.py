@@ -0,0 +1,82 @@
+import weakref
+from array import array
+from multiprocessing import shared_memory
+from typing import List, Tuple
+
+from .csr_graph import CSRGraph
+
+# (paylaşılan bellek bloğunun adı, dizi başına (typecode, bayt konumu, uzunluk))
+SharedGraphSpec = Tuple[str, List[Tuple[str, int, int]]]
+
+
+class _AttachedCSRGraph(CSRGraph):
+    """
+    Dizileri paylaşılan bellekteki memoryview'lar olan CSRGraph. memoryview'da
+    index() olmadığı için edge_index komşu dilimini listeye çevirip arar.
+    """
+
+    def edge_index(self, u: int, v: int) -> int:
+        start = self.offsets[u]
+        try:
+            return start + self.targets[start:self.offsets[u + 1]].tolist().index(v)
+        except ValueError:
+            raise KeyError((u, v)) from None
+
+
+class SharedCSRGraph:
+    """
+    Bir CSRGraph'ın ileri ve ters dizilerinin tek bir paylaşılan bellek
+    bloğundaki kopyası. Ana süreç bloğu bir kez doldurur; worker süreçleri
+    küçük spec ile attach() edip dizileri kopyalamadan okur, yani graf
+    görev başına (ya da worker başına) pickle edilmez.
+
+    Blok close() ile, ya da nesne toplandığında serbest bırakılır.
+    """
+
+    def __init__(self, graph: CSRGraph):
+        reverse = graph.reverse()
+        arrays = (graph.offsets, graph.targets, graph.weights, reverse.offsets, reverse.targets, reverse.weights)
+
+        layout = []
+        size = 0
+        for values in arrays:
+            # Her dizi 8 bayta hizalanır; memoryview.cast hizasız okumaz
+            size = (size + 7) & ~7
+            layout.append((values.typecode, size, len(values)))
+            size += len(values) * values.itemsize
+
+        self._memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for values, (_, start, length) in zip(arrays, layout):
+            self._memory.buf[start:start + length * values.itemsize] = memoryview(values).cast('B')
+
+        self.spec: SharedGraphSpec = (self._memory.name, layout)
+        self._release = weakref.finalize(self, _unlink, self._memory)
+
+    def close(self) -> None:
+        self._release()
+
+    @staticmethod
+    def attach(spec: SharedGraphSpec) -> CSRGraph:
+        """spec'teki bloğa bağlan; ters grafı da hazır, dizileri kopyasız bir CSRGraph döndür."""
+        name, layout = spec
+        memory = shared_memory.SharedMemory(name=name)
+        views = [
+            memory.buf[start:start + length * array(typecode).itemsize].cast(typecode)
+            for typecode, start, length in layout
+        ]
+
+        graph = _AttachedCSRGraph(*views[:3])
+        reverse = _AttachedCSRGraph.__new__(_AttachedCSRGraph)
+        reverse.offsets, reverse.targets, reverse.weights = views[3:]
+        reverse.labels, reverse._ids, reverse._index = None, None, None
+        reverse._reversed = graph
+        graph._reversed = reverse
+
+        # Blok, graf yaşadığı sürece açık kalır
+        graph._memory = memory
+        return graph
+
+
+def _unlink(memory: shared_memory.SharedMemory) -> None:
+    memory.close()
+    memory.unlink()
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from typing import Optional
+
+from .csr_graph import CSRGraph
+from .data_structures import GraphState
+
+# Varsayılan bellek bütçesi (byte). wiki-Talk'ta tek bir GraphState'in
+# yoğun dizileri ~60 MB tutar.
+DEFAULT_SPT_CACHE_BYTES = 512 * 2 ** 20
+
+
+class SPTCache:
+    """
+    Hedef düğüme göre anahtarlanmış, devam ettirilebilir GraphState'lerin
+    LRU önbelleği.
+
+    construct_partial_spt ters Dijkstra ağacını dest'ten büyütür ve bu ağaç
+    yalnızca dest'e bağlıdır. Aynı hedefe gelen ikinci sorgu, settle edilmiş
+    sınırdan (PQ) devam eder; baştan hesaplamaz.
+
+    Önbellekteki durumların tahmini bellek kullanımı max_bytes'ı aşarsa en
+    uzun süredir kullanılmayan durumlar atılır ve dizileri havuza geri döner.
+    """
+
+    def __init__(self, graph_reverse: CSRGraph, max_bytes: int = DEFAULT_SPT_CACHE_BYTES):
+        self.graph_reverse = graph_reverse
+        self.max_bytes = max_bytes
+        self._states: "OrderedDict[int, GraphState]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, destination: int) -> GraphState:
+        """destination için önbellekteki GraphState'i döndür, yoksa yenisini kur."""
+        graph_state = self._states.get(destination)
+
+        if graph_state is not None and graph_state.is_valid():
+            self._states.move_to_end(destination)
+            self.hits += 1
+        else:
+            graph_state = GraphState(self.graph_reverse, destination)
+            self._states[destination] = graph_state
+            self.misses += 1
+
+        self._evict(keep=destination)
+        return graph_state
+
+    def __contains__(self, destination: int) -> bool:
+        return destination in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def estimate_bytes(self, graph_state: GraphState) -> int:
+        """
+        Bir GraphState'in kaba bellek tahmini: üç yoğun dizi (düğüm başına
+        birer işaretçi), dokunulan düğümlerin mesafe float'ları ve PQ
+        girdileri (tuple + float).
+        """
+        n = self.graph_reverse.number_of_nodes()
+        return 3 * 8 * n + 32 * len(graph_state.touched) + 80 * len(graph_state.PQ)
+
+    def memory_usage(self) -> int:
+        return sum(self.estimate_bytes(s) for s in self._states.values())
+
+    def _evict(self, keep: Optional[int] = None) -> None:
+        usage = self.memory_usage()
+
+        while usage > self.max_bytes and len(self._states) > 1:
+            destination = next(iter(self._states))
+            if destination == keep:
+                self._states.move_to_end(destination)
+                destination = next(iter(self._states))
+
+            graph_state = self._states.pop(destination)
+            usage -= self.estimate_bytes(graph_state)
+            graph_state.release()
+
+    def clear(self) -> None:
+        for graph_state in self._states.values():
+            graph_state.release()
+        self._states.clear()